@@ -2,17 +2,43 @@
 # -----------------------------
 # Main Binance HFT Market Maker Bot Script
 # -----------------------------
+import argparse
 import asyncio
+import atexit
+import contextlib
+import hashlib
+import hmac
 import logging
 import logging.handlers
+import os
+import queue
+import re
+import selectors
+import socket
 import sys
+import time
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlencode
 
-from binance import AsyncClient
+import aiohttp
+import numpy as np
+
+try:
+    import orjson as fast_json  # C encoder/decoder for REST responses and batch payloads
+
+    def json_dumps(obj) -> str:
+        return fast_json.dumps(obj).decode()
+except ImportError:
+    import json as fast_json
+
+    def json_dumps(obj) -> str:
+        return fast_json.dumps(obj, separators=(',', ':'))
+
+from binance import AsyncClient, BinanceSocketManager
 from binance.enums import *
 from binance.exceptions import BinanceAPIException, BinanceRequestException
-from binance.helpers import round_step_size
 
 import key_file as k  # Ensure this file is secure and not tracked by version control
 
@@ -28,7 +54,7 @@ from rich import box
 
 # Create a logger for the BinanceBot
 logger = logging.getLogger("BinanceBot")
-logger.setLevel(logging.DEBUG)  # Set the default logging level to DEBUG for more detailed output
+logger.setLevel(logging.INFO)  # Set to logging.DEBUG to also log per-order and per-position detail
 
 # Define the log message format
 formatter = logging.Formatter('%(asctime)s %(levelname)s:%(message)s')
@@ -39,7 +65,6 @@ if not logger.hasHandlers():
     ch = logging.StreamHandler(sys.stdout)
     ch.setLevel(logging.DEBUG)  # Set logging level for console to DEBUG
     ch.setFormatter(formatter)  # Apply the formatter to console handler
-    logger.addHandler(ch)  # Add console handler to the logger
 
     # File Handler with Rotation
     fh = logging.handlers.RotatingFileHandler(
@@ -49,13 +74,163 @@ if not logger.hasHandlers():
     )
     fh.setLevel(logging.DEBUG)  # Set logging level for file handler to DEBUG
     fh.setFormatter(formatter)  # Apply the formatter to file handler
-    logger.addHandler(fh)  # Add file handler to the logger
+
+    # The event loop only enqueues records; console and file writes happen on a background thread
+    log_queue = queue.Queue(-1)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    log_listener = logging.handlers.QueueListener(log_queue, ch, fh, respect_handler_level=True)
+    log_listener.start()
+    atexit.register(log_listener.stop)  # Drain queued records on exit
+
+# -----------------------------
+# Exchange Limits
+# -----------------------------
+
+MAX_BATCH_ORDERS = 5  # Binance Futures accepts at most 5 orders per batchOrders request
+MAX_BATCH_CANCELS = 10  # ...and at most 10 order ids per batch cancel request
+
+# Base URLs for the direct REST path used by the hot endpoints
+_FAPI = "https://fapi.binance.com"
+_FAPI_TESTNET = "https://testnet.binancefuture.com"
+
+# Local budgets, kept below Binance's 1200 weight/min (per IP) and 2400 orders/min (per account) caps
+REQUEST_WEIGHT_PER_MINUTE = 1100
+ORDERS_PER_MINUTE = 2000
+
+POSITION_SNAPSHOT_TTL = 0.2  # Seconds a REST position snapshot is reused before another is requested
+MARK_PRICE_MAX_AGE = 5.0  # Seconds a streamed mark price is trusted before falling back to REST
+PNL_REFRESH_INTERVAL = 0.5  # Minimum seconds between PnL redraws, i.e. at most 2 Hz per bot
+GRID_CHECK_INTERVAL = 1.0  # While flat, seconds between checks that the grid still brackets the mark price
+
+# monitor_orders cross-checks open orders over REST after this long without a fill push,
+# doubling the wait on each quiet check up to the maximum
+ORDER_RECONCILE_MIN_WAIT = 1.0
+ORDER_RECONCILE_MAX_WAIT = 30.0
+
+# premiumIndex is a small fixed-schema object, so the REST mark price fallback reads markPrice straight
+# out of the response bytes instead of decoding the whole document
+MARK_PRICE_FIELD = re.compile(rb'"markPrice":"([^"]+)"')
+
+# -----------------------------
+# Binance Client
+# -----------------------------
+
+class FastJsonAsyncClient(AsyncClient):
+    """
+    AsyncClient that decodes REST responses with orjson (when installed) instead of the stdlib json module.
+    """
+
+    async def _handle_response(self, response: aiohttp.ClientResponse):
+        if not 200 <= response.status < 300:
+            raise BinanceAPIException(response, response.status, await response.text())
+        body = await response.read()
+        if not body:
+            return {}
+        try:
+            return fast_json.loads(body)
+        except ValueError:
+            raise BinanceRequestException(f"Invalid Response: {body.decode(errors='replace')}")
+
+def _low_latency_socket(addr_info) -> socket.socket:
+    """
+    Socket factory for the shared connector: disables Nagle's algorithm (TCP_NODELAY).
+
+    Args:
+        addr_info: (family, type, proto, canonname, sockaddr) tuple from getaddrinfo.
+
+    Returns:
+        socket.socket: Unconnected socket with the low-latency options applied.
+    """
+    family, type_, proto, _, _ = addr_info
+    sock = socket.socket(family=family, type=type_, proto=proto)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+def make_connector() -> aiohttp.TCPConnector:
+    """
+    Build the pooled connector used by the shared client's aiohttp session.
+
+    Connections to Binance are kept alive for 75s so order requests reuse warm TLS sessions.
+
+    Returns:
+        aiohttp.TCPConnector: Connector for AsyncClient.create(session_params={'connector': ...}).
+    """
+    return aiohttp.TCPConnector(
+        limit=200,
+        limit_per_host=50,
+        ttl_dns_cache=300,
+        keepalive_timeout=75,
+        socket_factory=_low_latency_socket,
+    )
+
+# -----------------------------
+# Rate Limiting
+# -----------------------------
+
+class RateLimiter:
+    """
+    Async leaky-bucket limiter that paces REST calls below a per-period budget.
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 60):
+        """
+        Args:
+            max_rate (float): Budget (request weight or order count) allowed per period.
+            time_period (float): Length of the period in seconds.
+        """
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._level = 0.0  # Budget currently in use; drains continuously at max_rate per period
+        self._last_drain = time.monotonic()
+
+    def _drain(self):
+        now = time.monotonic()
+        self._level = max(0.0, self._level - (now - self._last_drain) * self.max_rate / self.time_period)
+        self._last_drain = now
+
+    async def acquire(self, amount: float = 1):
+        """
+        Wait until `amount` fits in the budget, then consume it.
+        """
+        while True:
+            self._drain()
+            if self._level + amount <= self.max_rate:
+                self._level += amount
+                return
+            await asyncio.sleep((self._level + amount - self.max_rate) * self.time_period / self.max_rate)
+
+    def sync(self, used: float):
+        """
+        Raise the local level to the usage reported by the server so both counters agree.
+        """
+        self._drain()
+        self._level = max(self._level, used)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+# Shared by every bot in the process: weight is counted per IP and orders per account
+WEIGHT_LIMITER = RateLimiter(REQUEST_WEIGHT_PER_MINUTE)
+ORDER_LIMITER = RateLimiter(ORDERS_PER_MINUTE)
+
+def sync_used_weight(headers):
+    """
+    Align WEIGHT_LIMITER with the X-MBX-USED-WEIGHT-1M header of a Binance response.
+    """
+    if isinstance(headers, Mapping):
+        used = headers.get('X-MBX-USED-WEIGHT-1M')
+        if used is not None:
+            WEIGHT_LIMITER.sync(int(used))
 
 # -----------------------------
 # Data Classes for Configuration
 # -----------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BotConfig:
     """
     Dataclass to store configuration parameters for each trading bot.
@@ -69,6 +244,15 @@ class BotConfig:
     num_of_grids: int
     leverage: int = 1
     testnet: bool = False
+    pin_cpu: Optional[int] = None  # CPU to pin the event loop to (Linux only); None leaves scheduling to the OS
+
+@dataclass(slots=True)
+class OrderRow:
+    """
+    Compact record of a resting grid order, keyed by orderId in BinanceBot.active_orders.
+    """
+    side: str  # SIDE_BUY or SIDE_SELL (shared interned constants)
+    ticks: int  # Price as a whole number of ticks; converted to a price string only when sent
 
 # -----------------------------
 # BinanceBot Class Definition
@@ -79,12 +263,22 @@ class BinanceBot:
     A class representing a Binance trading bot with grid and take-profit strategies.
     """
 
-    def __init__(self, config: BotConfig):
+    # Fixed attribute layout: no per-instance __dict__, and attribute access is a slot lookup
+    __slots__ = (
+        'config', 'api_key', 'api_secret', 'client', '_sess', '_fapi', '_hdr', '_hmac',
+        '_mark_prices', '_mark_price_times', '_exchange_filters', 'tick_size', '_scale', '_tick_int', '_inv_tick', '_price_fmt', '_grid_levels',
+        '_grid_center_ticks',
+        'active_orders', '_pending_batch', '_order_lock', '_position_synced_at', '_position_sync', 'position_state',
+        '_order_event', '_position_event', '_pnl_event', 'console', 'table', '_pnl_cells',
+    )
+
+    def __init__(self, config: BotConfig, client: Optional[AsyncClient] = None):
         """
         Initialize the BinanceBot with the given configuration.
 
         Args:
             config (BotConfig): Configuration parameters for the bot.
+            client (Optional[AsyncClient]): Binance client shared by all bots in the process.
         """
         self.config = config
         self.api_key = k.binance_testnet_api_key  # Directly assign the key
@@ -98,9 +292,32 @@ class BinanceBot:
         else:
             print(f"Initialized BinanceBot for {self.config.symbol} with leverage {self.config.leverage}x.")
 
-        self.client: Optional[AsyncClient] = None  # Binance AsyncClient will be initialized later
+        self.client: Optional[AsyncClient] = client  # Shared Binance AsyncClient, created once in main()
+        self._sess = None  # aiohttp session borrowed from the client for direct REST calls
+        self._fapi = _FAPI_TESTNET if self.config.testnet else _FAPI
+        self._hdr = {'X-MBX-APIKEY': self.api_key}
+        self._hmac = hmac.new(self.api_secret.encode(), digestmod=hashlib.sha256)  # Keyed once, copied per request
+        self._mark_prices = MARK_PRICES  # Latest mark prices, pushed by the shared markPrice stream in main()
+        self._mark_price_times = MARK_PRICE_TIMES  # monotonic receive time of each pushed mark price
+        self._exchange_filters = EXCHANGE_FILTERS  # symbol -> filterType -> filter, preloaded once in main()
         self.tick_size: Optional[float] = None  # To store tick size
-        self.active_orders = {}  # To track active orders
+        self._scale = 100_000_000  # Fixed-point scale for tick arithmetic (1e-8 resolution)
+        self._tick_int: Optional[int] = None  # Tick size in units of 1/_scale, set in get_tick_size
+        self._inv_tick: Optional[float] = None  # Ticks per unit of price (_scale / _tick_int), set in get_tick_size
+        self._grid_levels = np.arange(1, self.config.num_of_grids + 1, dtype=np.int64)  # Grid offsets in ticks
+        self._grid_center_ticks: Optional[int] = None  # Mark price, in ticks, the current grid was drawn around
+        self._price_fmt = "%s"  # printf-style price format, narrowed to the tick size's decimals in get_tick_size
+        self.active_orders: Dict[int, OrderRow] = {}  # To track active orders
+        self._pending_batch: List[Tuple[int, dict]] = []  # (ticks, params) waiting for the next batch submission
+        self._order_lock = asyncio.Lock()  # Serializes batch submissions with the cancel-and-redraw of the grid
+        self._position_synced_at = 0.0  # monotonic time of the last REST position snapshot
+        self._position_sync: Optional[asyncio.Task] = None  # The latest snapshot request, awaited by overlapping callers
+        # Position cache kept current by ACCOUNT_UPDATE events on the user data stream
+        self.position_state: Dict[str, float] = {'positionAmt': 0.0, 'entryPrice': 0.0, 'unRealizedProfit': 0.0}
+        # Set by the user data stream so the monitor loops only wake on real changes
+        self._order_event = asyncio.Event()
+        self._position_event = asyncio.Event()
+        self._pnl_event = asyncio.Event()  # Same position updates, consumed by monitor_pnl
 
         # Initialize rich console for attractive terminal output
         self.console = Console()
@@ -112,26 +329,25 @@ class BinanceBot:
         self.table.add_column("Unrealized PnL")
         self.table.add_column("PnL (%)")
         self.table.add_column("Net PnL")
+        # A single row whose cells monitor_pnl overwrites in place
+        self.table.add_row(self.config.symbol, "0", "-", "-", "-", "-", "-")
+        self._pnl_cells = [column._cells for column in self.table.columns]
 
     async def initialize_client(self):
         """
-        Initialize the Binance AsyncClient and set leverage for the trading symbol.
+        Prepare the shared Binance client for this symbol: set leverage, tick size and initial position.
         """
         try:
-            # Create an asynchronous Binance client
-            self.client = await AsyncClient.create(
-                api_key=self.api_key,
-                api_secret=self.api_secret,
-                tld='com',  # Top-level domain (change if using a different Binance domain)
-                testnet=self.config.testnet  # Use testnet if specified
-            )
-            logger.info(f"Initialized Binance client for {self.config.symbol}")
+            self._sess = self.client.session
 
             # Set leverage for the trading symbol
             await self.set_leverage()
 
             # Retrieve and set tick size
             await self.get_tick_size()
+
+            # Seed the position cache once; the user data stream keeps it current afterwards
+            await self.sync_position()
         except BinanceAPIException as e:
             logger.error(f"Binance API Exception during client initialization: {e}")
             sys.exit(1)
@@ -142,19 +358,81 @@ class BinanceBot:
             logger.error(f"Unexpected error during client initialization: {e}")
             sys.exit(1)  # Exit the program if client initialization fails
 
+    async def _call(self, method, weight: int = 1, orders: int = 0, **params):
+        """
+        Run a python-binance client call under the shared rate limiters.
+
+        The used-weight header is not synced here: the client is shared, so its last response may
+        belong to another bot's request. _fapi_request syncs from its own responses instead.
+
+        Args:
+            method: Bound AsyncClient coroutine method, e.g. self.client.futures_exchange_info.
+            weight (int): Request weight of the endpoint.
+            orders (int): Number of orders the call places.
+            **params: Parameters forwarded to the client method.
+        """
+        await WEIGHT_LIMITER.acquire(weight)
+        if orders:
+            await ORDER_LIMITER.acquire(orders)
+        return await method(**params)
+
+    async def _fapi_request(self, method: str, path: str, params: dict, signed: bool = True,
+                            weight: int = 1, orders: int = 0, raw: bool = False):
+        """
+        Call a Binance Futures REST endpoint directly on the client's aiohttp session.
+
+        Used for the hot endpoints (order placement/cancellation, open orders, mark price) to skip
+        python-binance's generic request dispatcher. Cold-path calls still go through the client.
+
+        Args:
+            method (str): HTTP method ('GET', 'POST' or 'DELETE').
+            path (str): Endpoint path, e.g. '/fapi/v1/order'.
+            params (dict): Request parameters.
+            signed (bool): Whether to add a timestamp and HMAC signature.
+            weight (int): Request weight of the endpoint.
+            orders (int): Number of orders the call places.
+            raw (bool): Return the undecoded response body instead of parsing it.
+
+        Returns:
+            Decoded JSON response, or the response bytes if raw is set.
+
+        Raises:
+            BinanceAPIException: If Binance returns a non-2xx status.
+        """
+        await WEIGHT_LIMITER.acquire(weight)
+        if orders:
+            await ORDER_LIMITER.acquire(orders)
+        query = urlencode(params)
+        if signed:
+            query += f"&timestamp={int(time.time() * 1000 + self.client.timestamp_offset)}"
+            mac = self._hmac.copy()
+            mac.update(query.encode())
+            query += f"&signature={mac.hexdigest()}"
+        async with self._sess.request(method, f"{self._fapi}{path}?{query}", headers=self._hdr) as response:
+            body = await response.read()
+            sync_used_weight(response.headers)
+            if not 200 <= response.status < 300:
+                raise BinanceAPIException(response, response.status, body.decode())
+            return body if raw else fast_json.loads(body)
+
     async def get_tick_size(self):
         """
-        Retrieve the tick size for the trading symbol from exchange information.
+        Retrieve the tick size for the trading symbol from the shared exchange filters.
+
+        Exchange info is only requested here if main() has not already loaded it.
         """
         try:
-            exchange_info = await self.client.futures_exchange_info()
-            symbol_info = next((s for s in exchange_info['symbols'] if s['symbol'] == self.config.symbol), None)
-            if symbol_info:
-                for f in symbol_info['filters']:
-                    if f['filterType'] == 'PRICE_FILTER':
-                        self.tick_size = float(f['tickSize'])
-                        logger.info(f"Tick size for {self.config.symbol} is {self.tick_size}")
-                        return
+            if self.config.symbol not in self._exchange_filters:
+                await load_exchange_filters(self.client, self._exchange_filters)
+            f = self._exchange_filters.get(self.config.symbol, {}).get('PRICE_FILTER')
+            if f:
+                self.tick_size = float(f['tickSize'])
+                self._tick_int = int(round(self.tick_size * self._scale))
+                self._inv_tick = self._scale / self._tick_int  # _to_ticks multiplies instead of dividing
+                # e.g. tickSize '0.10' -> '%.1f', so prices are rendered at exactly tick precision
+                self._price_fmt = f"%.{len(f['tickSize'].rstrip('0').partition('.')[2])}f"
+                logger.info(f"Tick size for {self.config.symbol} is {self.tick_size}")
+                return
             logger.error(f"Could not retrieve tick size for {self.config.symbol}")
             sys.exit(1)
         except BinanceAPIException as e:
@@ -167,12 +445,37 @@ class BinanceBot:
             logger.error(f"Unexpected error fetching exchange info: {e}")
             sys.exit(1)
 
+    def _to_ticks(self, price: float) -> int:
+        """
+        Convert a price to the nearest whole number of ticks.
+
+        Args:
+            price (float): Price to convert.
+
+        Returns:
+            int: Price in ticks.
+        """
+        return int(price * self._inv_tick + 0.5)
+
+    def _tick_price(self, ticks: int) -> float:
+        """
+        Convert a whole number of ticks back to a price.
+
+        Args:
+            ticks (int): Price in ticks.
+
+        Returns:
+            float: Price on the tick grid.
+        """
+        return ticks * self._tick_int / self._scale
+
     async def set_leverage(self):
         """
         Set the leverage for the specified trading symbol.
         """
         try:
-            response = await self.client.futures_change_leverage(
+            response = await self._call(
+                self.client.futures_change_leverage,
                 symbol=self.config.symbol,
                 leverage=self.config.leverage
             )
@@ -184,51 +487,208 @@ class BinanceBot:
         except Exception as e:
             logger.error(f"Unexpected error setting leverage: {e}")
 
-    async def get_position_direction(self) -> str:
+    async def sync_position(self):
         """
-        Determine the current position direction: LONG, SHORT, or FLAT.
+        Seed self.position_state from a REST snapshot of the position.
 
-        Returns:
-            str: 'LONG', 'SHORT', or 'FLAT'.
+        Snapshots are at most one per POSITION_SNAPSHOT_TTL seconds. Callers that overlap (startup
+        and a user stream reconnect, say) await the same request, so none returns before it has landed.
+        """
+        task = self._position_sync
+        now = time.monotonic()
+        if task is None or (task.done() and now - self._position_synced_at >= POSITION_SNAPSHOT_TTL):
+            self._position_synced_at = now
+            task = self._position_sync = asyncio.create_task(self._fetch_position())
+        # Shielded so a caller being cancelled does not cancel the request for the others
+        await asyncio.shield(task)
+
+    async def _fetch_position(self):
+        """
+        Fetch the symbol's position over REST into self.position_state.
         """
         try:
-            positions = await self.client.futures_position_information(symbol=self.config.symbol)
+            # Always scoped to the symbol, so the server returns one row rather than the whole account
+            positions = await self._call(self.client.futures_position_information, weight=5, symbol=self.config.symbol)
             for position in positions:
                 if position['symbol'] == self.config.symbol:
-                    position_amt = float(position['positionAmt'])
-                    logger.debug(f"Position for {self.config.symbol}: {position_amt}")
-                    if position_amt > 0:
-                        logger.info(f"Current position is LONG for {self.config.symbol}")
-                        return "LONG"
-                    elif position_amt < 0:
-                        logger.info(f"Current position is SHORT for {self.config.symbol}")
-                        return "SHORT"
-                    else:
-                        logger.info(f"Current position is FLAT for {self.config.symbol}")
-                        return "FLAT"
+                    self.position_state = {
+                        'positionAmt': float(position['positionAmt']),
+                        'entryPrice': float(position['entryPrice']),
+                        'unRealizedProfit': float(position.get('unRealizedProfit', 0)),
+                    }
+                    return
             logger.info(f"No matching symbol found in position information for {self.config.symbol}.")
-            return "FLAT"
         except BinanceAPIException as e:
-            logger.error(f"Binance API Error determining position direction: {e}")
-            return "FLAT"
+            self._position_synced_at = 0.0  # Let the next caller retry straight away
+            logger.error(f"Binance API Error fetching position information: {e}")
         except BinanceRequestException as e:
-            logger.error(f"Binance Request Error determining position direction: {e}")
-            return "FLAT"
+            self._position_synced_at = 0.0
+            logger.error(f"Binance Request Error fetching position information: {e}")
+        except Exception as e:
+            self._position_synced_at = 0.0
+            logger.error(f"Error fetching position information: {e}")
+
+    async def _user_stream_loop(self):
+        """
+        Consume the futures user data stream and dispatch account and order events.
+
+        python-binance creates the listenKey and keeps it alive; if the key expires anyway, or the socket
+        reports an error, the stream is reopened with a fresh key and the position re-seeded.
+        """
+        bsm = BinanceSocketManager(self.client)
+        while True:
+            try:
+                async with bsm.futures_user_socket() as stream:
+                    while True:
+                        msg = await stream.recv()
+                        event = msg.get('e')
+                        if event == 'listenKeyExpired':
+                            raise BinanceRequestException("user data stream listenKey expired")
+                        if event == 'error':
+                            raise BinanceRequestException(msg.get('m', 'user data stream error'))
+                        self._handle_user_event(msg)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in user data stream for {self.config.symbol}: {e}")
+                await asyncio.sleep(1)  # Reconnect after a short pause
+                # Events may have been missed while disconnected; re-seed and re-evaluate
+                await self.sync_position()
+                await self.reconcile_orders()
+                self._position_event.set()
+                self._pnl_event.set()
+
+    async def reconcile_orders(self):
+        """
+        Resolve tracked orders that are no longer open on the exchange but whose final push never arrived.
+
+        An order can also disappear without filling (cancelled externally, or its CANCELED push lost), so
+        each one's status is confirmed first: only FILLED orders are replaced, the rest are just dropped.
+        """
+        try:
+            # Snapshot before the request: orders placed (or cancelled) while it is in flight would
+            # otherwise be missing from the response and look filled
+            tracked = list(self.active_orders)
+            open_orders = await self._fapi_request('GET', '/fapi/v1/openOrders', {'symbol': self.config.symbol})
+            open_ids = {order['orderId'] for order in open_orders}
+            missed = [order_id for order_id in tracked if order_id not in open_ids and order_id in self.active_orders]
+            if not missed:
+                return
+            statuses = await asyncio.gather(*(
+                self._fapi_request('GET', '/fapi/v1/order', {'symbol': self.config.symbol, 'orderId': order_id})
+                for order_id in missed
+            ), return_exceptions=True)
+            filled = 0
+            for order_id, order in zip(missed, statuses):
+                if isinstance(order, Exception):
+                    # Still tracked, so the next reconcile retries it
+                    logger.error(f"Error fetching status of order {order_id} for {self.config.symbol}: {order}")
+                elif order['status'] == 'FILLED':
+                    self._replace_filled(order_id)
+                    filled += 1
+                else:
+                    self.active_orders.pop(order_id, None)
+            logger.info("Reconciled %d orders for %s: %d filled, %d closed without a fill",
+                        len(missed), self.config.symbol, filled, len(missed) - filled)
+        except BinanceAPIException as e:
+            logger.error(f"Binance API Error reconciling open orders: {e}")
+        except BinanceRequestException as e:
+            logger.error(f"Binance Request Error reconciling open orders: {e}")
         except Exception as e:
-            logger.error(f"Error determining position direction: {e}")
+            logger.error(f"Error reconciling open orders: {e}")
+
+    def _handle_user_event(self, msg: dict):
+        """
+        Apply an ACCOUNT_UPDATE or ORDER_TRADE_UPDATE event to the local position and order caches.
+
+        Args:
+            msg (dict): Decoded user data stream event.
+        """
+        event = msg.get('e')
+        if event == 'ACCOUNT_UPDATE':
+            for position in msg['a']['P']:
+                if position['s'] == self.config.symbol:
+                    self.position_state = {
+                        'positionAmt': float(position['pa']),
+                        'entryPrice': float(position['ep']),
+                        'unRealizedProfit': float(position['up']),
+                    }
+                    self._position_event.set()
+                    self._pnl_event.set()
+        elif event == 'ORDER_TRADE_UPDATE':
+            order = msg['o']
+            if order['s'] != self.config.symbol or order['o'] != ORDER_TYPE_LIMIT:
+                return
+            order_id = order['i']
+            status = order['X']
+            if status == 'NEW':
+                # Usually already tracked from the placement response; covers pushes that beat it
+                self.active_orders.setdefault(order_id, OrderRow(order['S'], self._to_ticks(float(order['p']))))
+            elif status == 'FILLED':
+                self._replace_filled(order_id)
+            elif status in ('CANCELED', 'EXPIRED'):
+                self.active_orders.pop(order_id, None)
+
+    def _replace_filled(self, order_id: int):
+        """
+        Stop tracking a filled grid order and queue its replacement one tick further out.
+
+        The replacement is sent by monitor_orders, which is woken through _order_event.
+
+        Args:
+            order_id (int): Id of the filled order.
+        """
+        order_info = self.active_orders.pop(order_id, None)
+        if order_info is None:
+            return  # Not one of ours, or already replaced
+        if order_info.side == SIDE_SELL:
+            self.queue_limit_order(SIDE_SELL, self.config.volume, order_info.ticks + 1)
+        else:
+            self.queue_limit_order(SIDE_BUY, self.config.volume, order_info.ticks - 1)
+        self._order_event.set()
+
+    async def get_position_direction(self) -> str:
+        """
+        Determine the current position direction: LONG, SHORT, or FLAT.
+
+        Read from the position cache maintained by the user data stream.
+
+        Returns:
+            str: 'LONG', 'SHORT', or 'FLAT'.
+        """
+        position_amt = self.position_state['positionAmt']
+        logger.debug("Position for %s: %s", self.config.symbol, position_amt)
+        if position_amt > 0:
+            return "LONG"
+        elif position_amt < 0:
+            return "SHORT"
+        else:
             return "FLAT"
 
     async def get_mark_price(self) -> Optional[float]:
         """
         Retrieve the current mark price for the trading symbol.
 
+        Served from the shared markPrice WebSocket stream; falls back to REST until the first frame arrives,
+        or when the stream has gone quiet for longer than MARK_PRICE_MAX_AGE.
+
         Returns:
             Optional[float]: Current mark price if successful, else None.
         """
+        symbol = self.config.symbol
+        price = self._mark_prices.get(symbol)
+        if price is not None and time.monotonic() - self._mark_price_times.get(symbol, 0.0) < MARK_PRICE_MAX_AGE:
+            return price
         try:
-            ticker = await self.client.futures_mark_price(symbol=self.config.symbol)
-            price = float(ticker['markPrice'])
-            logger.debug(f"Mark price for {self.config.symbol}: {price}")
+            body = await self._fapi_request('GET', '/fapi/v1/premiumIndex', {'symbol': self.config.symbol},
+                                            signed=False, raw=True)
+            match = MARK_PRICE_FIELD.search(body)
+            if match is None:
+                logger.error(f"No mark price in premiumIndex response for {self.config.symbol}")
+                return None
+            price = float(match.group(1))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Mark price for %s: %s", self.config.symbol, price)
             return price
         except BinanceAPIException as e:
             logger.error(f"Binance API Error fetching mark price: {e}")
@@ -240,67 +700,145 @@ class BinanceBot:
             logger.error(f"Error fetching mark price: {e}")
             return None
 
-    async def draw_grid(self):
+    async def draw_grid(self, current_price: Optional[float] = None):
         """
         Place grid of tight limit buy and sell orders around the current market price.
+
+        Args:
+            current_price (Optional[float]): Mark price to centre the grid on; fetched if not given.
         """
-        current_price = await self.get_mark_price()
+        if current_price is None:
+            current_price = await self.get_mark_price()
         if current_price is None:
             logger.warning("Current price unavailable. Skipping grid drawing.")
             return
 
         grid_spacing = self.tick_size  # Set grid spacing to tick size for tight spreads
-        logger.info(f"Drawing grid with {self.config.num_of_grids} levels at tick size intervals ({grid_spacing}).")
+        logger.info("Drawing grid with %d levels at tick size intervals (%s).", self.config.num_of_grids, grid_spacing)
 
-        for i in range(1, self.config.num_of_grids + 1):
-            sell_price = round_step_size(
-                current_price + (grid_spacing * i),
-                step_size=self.tick_size
-            )
-            buy_price = round_step_size(
-                current_price - (grid_spacing * i),
-                step_size=self.tick_size
-            )
-            logger.info(f"Placing SELL limit order at {sell_price} and BUY limit order at {buy_price}.")
-            sell_volume = round(100 / current_price, self.config.no_of_decimal_places)
-            sell_order = await self.place_limit_order(SIDE_SELL, sell_volume, sell_price)
-            buy_volume = round(100 / current_price, self.config.no_of_decimal_places)
-            buy_order = await self.place_limit_order(SIDE_BUY, buy_volume, buy_price)
-            if sell_order:
-                self.active_orders[sell_order['orderId']] = {'side': SIDE_SELL, 'price': sell_price}
-            if buy_order:
-                self.active_orders[buy_order['orderId']] = {'side': SIDE_BUY, 'price': buy_price}
+        # All grid levels at once, as whole ticks above/below the mark price
+        mark_ticks = self._to_ticks(current_price)
+        self._grid_center_ticks = mark_ticks
+        sell_ticks = (mark_ticks + self._grid_levels).tolist()
+        buy_ticks = (mark_ticks - self._grid_levels).tolist()
+        # Every level trades the same size, so it is rounded and formatted once per draw
+        volume = str(round(100 / current_price, self.config.no_of_decimal_places))
+        logger.debug("Queueing SELL limit orders at ticks %s and BUY limit orders at ticks %s.", sell_ticks, buy_ticks)
+
+        # The whole grid is queued, then sent as concurrent batchOrders requests of MAX_BATCH_ORDERS
+        queue_limit_order = self.queue_limit_order
+        for sell_tick, buy_tick in zip(sell_ticks, buy_ticks):
+            queue_limit_order(SIDE_SELL, volume, sell_tick)
+            queue_limit_order(SIDE_BUY, volume, buy_tick)
+        await self._submit_pending()
+
+    async def redraw_grid(self, current_price: float):
+        """
+        Cancel the resting grid and draw a new one around the given mark price.
+
+        Holds _order_lock throughout, so no batch flushed by monitor_orders can land between the
+        cancel and the new grid, and fill replacements queued for the old grid are dropped.
+
+        Args:
+            current_price (float): Mark price to centre the new grid on.
+        """
+        async with self._order_lock:
+            self._pending_batch = []
+            if self.active_orders:
+                await self.cancel_orders()  # Replace the stale grid rather than stacking a new one on it
+            await self.draw_grid(current_price)
 
-    async def place_limit_order(self, side: str, quantity: float, price: float) -> Optional[dict]:
+    def queue_limit_order(self, side: str, quantity: Union[float, str], ticks: int):
         """
-        Place a limit order on Binance Futures.
+        Queue a limit order for the next flush_pending_orders() call.
 
         Args:
             side (str): 'BUY' or 'SELL'.
-            quantity (float): Quantity to trade.
-            price (float): Price at which to place the order.
+            quantity (Union[float, str]): Quantity to trade, optionally already formatted.
+            ticks (int): Price at which to place the order, in ticks.
+        """
+        self._pending_batch.append((ticks, {
+            'symbol': self.config.symbol,
+            'side': side,
+            'type': ORDER_TYPE_LIMIT,
+            'timeInForce': TIME_IN_FORCE_GTC,
+            'quantity': str(quantity),
+            'price': self._price_fmt % self._tick_price(ticks),
+        }))
 
-        Returns:
-            Optional[dict]: Response from Binance API if successful, else None.
+    async def flush_pending_orders(self):
+        """
+        Submit all queued limit orders, MAX_BATCH_ORDERS per batchOrders request, with the requests in flight concurrently.
+        """
+        async with self._order_lock:
+            await self._submit_pending()
+
+    async def _submit_pending(self):
+        """
+        Send the queued limit orders; callers other than flush_pending_orders hold _order_lock themselves.
+        """
+        if not self._pending_batch:
+            return
+        pending, self._pending_batch = self._pending_batch, []
+        await asyncio.gather(*(
+            self._place_batch(pending[i:i + MAX_BATCH_ORDERS]) for i in range(0, len(pending), MAX_BATCH_ORDERS)
+        ))
+
+    async def _place_batch(self, batch: List[Tuple[int, dict]]):
+        """
+        Place up to MAX_BATCH_ORDERS limit orders in one batchOrders request and track the accepted ones.
+
+        Args:
+            batch (List[Tuple[int, dict]]): (ticks, order params) pairs.
         """
         try:
-            order = await self.client.futures_create_order(
-                symbol=self.config.symbol,
-                side=side,
-                type=ORDER_TYPE_LIMIT,
-                timeInForce=TIME_IN_FORCE_GTC,
-                quantity=quantity,
-                price=str(price),  # Price must be a string
+            results = await self._fapi_request(
+                'POST', '/fapi/v1/batchOrders', {'batchOrders': json_dumps([params for _, params in batch])},
+                weight=5, orders=len(batch)
             )
-            logger.info(f"{side} limit order placed: {order}")
-            return order
         except BinanceAPIException as e:
-            logger.error(f"Binance API Error placing {side} order: {e}")
+            logger.error(f"Binance API Error placing batch of {len(batch)} orders: {e}")
+            return
         except BinanceRequestException as e:
-            logger.error(f"Binance Request Error placing {side} order: {e}")
+            logger.error(f"Binance Request Error placing batch of {len(batch)} orders: {e}")
+            return
         except Exception as e:
-            logger.error(f"Unexpected error placing {side} order: {e}")
-        return None  # Return None if order placement fails
+            logger.error(f"Unexpected error placing batch of {len(batch)} orders: {e}")
+            return
+
+        # Results come back in submission order; rejected entries carry 'code'/'msg' instead of an orderId
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for (ticks, params), result in zip(batch, results):
+            if 'orderId' in result:
+                self.active_orders[result['orderId']] = OrderRow(params['side'], ticks)
+                if debug:
+                    logger.debug("%s limit order placed: %r", params['side'], result)
+            else:
+                logger.error(f"Batch {params['side']} order at {params['price']} rejected: {result}")
+
+    async def _cancel_batch(self, order_ids: List[int]) -> List[int]:
+        """
+        Cancel up to MAX_BATCH_CANCELS orders in one batchOrders request.
+
+        Args:
+            order_ids (List[int]): Ids of the orders to cancel.
+
+        Returns:
+            List[int]: Ids of the orders Binance confirmed as canceled.
+        """
+        results = await self._fapi_request('DELETE', '/fapi/v1/batchOrders', {
+            'symbol': self.config.symbol,
+            'orderIdList': '[' + ','.join(map(str, order_ids)) + ']'
+        })
+        # As with placement, rejected entries carry 'code'/'msg' instead of an orderId
+        canceled = []
+        for order_id, result in zip(order_ids, results):
+            if 'orderId' in result:
+                canceled.append(order_id)
+            else:
+                logger.error(f"Cancel of order {order_id} rejected: {result}")
+        logger.debug("Canceled orders %s for %s", canceled, self.config.symbol)
+        return canceled
 
     async def cancel_orders(self, side: Optional[str] = None):
         """
@@ -310,23 +848,38 @@ class BinanceBot:
             side (Optional[str]): 'BUY' or 'SELL' to filter orders by side. If None, cancels all orders.
         """
         try:
-            open_orders = await self.client.futures_get_open_orders(symbol=self.config.symbol)
-            if side:
-                open_orders = [order for order in open_orders if order['side'] == side.upper()]
-                logger.info(f"Found {len(open_orders)} open {side.upper()} orders to cancel for {self.config.symbol}.")
-            else:
-                logger.info(f"Found {len(open_orders)} open orders to cancel for {self.config.symbol}.")
-
-            for order in open_orders:
-                await self.client.futures_cancel_order(symbol=self.config.symbol, orderId=order['orderId'])
-                logger.info(f"Canceled order {order['orderId']} for {self.config.symbol}")
-                # Remove from active_orders if present
-                self.active_orders.pop(order['orderId'], None)
+            if not side:
+                # A single request clears the whole book for the symbol
+                await self._fapi_request('DELETE', '/fapi/v1/allOpenOrders', {'symbol': self.config.symbol})
+                self.active_orders.clear()
+                self._pending_batch = []  # Replacements queued for the cancelled orders must not be sent either
+                logger.info("All orders canceled for %s", self.config.symbol)
+                return
+
+            # active_orders is kept current by the user data stream, so no openOrders round-trip is needed
+            side = side.upper()
+            order_ids = [order_id for order_id, order in self.active_orders.items() if order.side == side]
+            logger.info("Found %d open %s orders to cancel for %s.", len(order_ids), side, self.config.symbol)
+
+            # Cancel in concurrent batches instead of one signed request per order;
+            # a failed batch doesn't stop the others from being applied
+            results = await asyncio.gather(*(
+                self._cancel_batch(order_ids[i:i + MAX_BATCH_CANCELS])
+                for i in range(0, len(order_ids), MAX_BATCH_CANCELS)
+            ), return_exceptions=True)
+
+            canceled = set()
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error canceling {side} order batch for {self.config.symbol}: {result}")
+                else:
+                    canceled.update(result)
+            # Drop the canceled orders in one pass
+            self.active_orders = {
+                order_id: order for order_id, order in self.active_orders.items() if order_id not in canceled
+            }
 
-            if side:
-                logger.info(f"All {side} orders canceled for {self.config.symbol}")
-            else:
-                logger.info(f"All orders canceled for {self.config.symbol}")
+            logger.info("Canceled %d of %d %s orders for %s", len(canceled), len(order_ids), side, self.config.symbol)
         except BinanceAPIException as e:
             logger.error(f"Binance API Error canceling orders: {e}")
         except BinanceRequestException as e:
@@ -340,34 +893,25 @@ class BinanceBot:
     async def monitor_orders(self):
         """
         Monitor active orders and place new ones immediately after orders are filled.
+
+        Fills are detected by the user data stream, which queues their replacements and wakes this loop
+        through _order_event. While no fills arrive, open orders are reconciled over REST on a backoff in case a push was lost.
         """
+        idle_wait = ORDER_RECONCILE_MIN_WAIT
         while True:
             try:
-                # Fetch all active orders from Binance
-                open_orders = await self.client.futures_get_open_orders(symbol=self.config.symbol)
-                open_order_ids = {order['orderId'] for order in open_orders}
-
-                # Identify filled orders by comparing with tracked active_orders
-                filled_order_ids = set(self.active_orders.keys()) - open_order_ids
-
-                for order_id in filled_order_ids:
-                    order_info = self.active_orders.pop(order_id, None)
-                    if order_info:
-                        side = order_info['side']
-                        price = order_info['price']
-                        # Place a new order to maintain the grid
-                        if side == SIDE_SELL:
-                            new_sell_price = round_step_size(price + self.tick_size, step_size=self.tick_size)
-                            new_order = await self.place_limit_order(SIDE_SELL, self.config.volume, new_sell_price)
-                            if new_order:
-                                self.active_orders[new_order['orderId']] = {'side': SIDE_SELL, 'price': new_sell_price}
-                        elif side == SIDE_BUY:
-                            new_buy_price = round_step_size(price - self.tick_size, step_size=self.tick_size)
-                            new_order = await self.place_limit_order(SIDE_BUY, self.config.volume, new_buy_price)
-                            if new_order:
-                                self.active_orders[new_order['orderId']] = {'side': SIDE_BUY, 'price': new_buy_price}
-
-                await asyncio.sleep(0.5)  # Short sleep for high-frequency monitoring
+                # Replacements were queued by _replace_filled as the fills came in; send them
+                await self.flush_pending_orders()
+
+                # Sleep until the user data stream reports the next fill
+                try:
+                    await asyncio.wait_for(self._order_event.wait(), timeout=idle_wait)
+                    self._order_event.clear()
+                    idle_wait = ORDER_RECONCILE_MIN_WAIT
+                except asyncio.TimeoutError:
+                    if self.active_orders:
+                        await self.reconcile_orders()
+                    idle_wait = min(idle_wait * 2, ORDER_RECONCILE_MAX_WAIT)
             except BinanceAPIException as e:
                 logger.error(f"Binance API Error in monitor_orders: {e}")
                 await asyncio.sleep(1)
@@ -381,18 +925,22 @@ class BinanceBot:
     async def monitor_position(self):
         """
         Monitor the position and manage orders accordingly.
+
+        Re-evaluated on start and whenever the user data stream reports an ACCOUNT_UPDATE, and every
+        GRID_CHECK_INTERVAL while flat. The grid is only redrawn once the mark price has left it.
         """
         logger.info("Starting position monitoring.")
 
         while True:
             try:
                 direction = await self.get_position_direction()
+                wait = None
                 if direction != "FLAT":
-                    logger.info(f"Position detected: {direction} for {self.config.symbol}")
+                    logger.info("Position detected: %s for %s", direction, self.config.symbol)
 
                     # Cancel opposing side orders to avoid conflicting orders
                     opposing_side = SIDE_SELL if direction == "LONG" else SIDE_BUY
-                    logger.info(f"Cancelling opposing side orders: {opposing_side}")
+                    logger.info("Cancelling opposing side orders: %s", opposing_side)
                     await self.cancel_orders(side=opposing_side)
 
                     # Calculate and place take-profit order
@@ -402,10 +950,18 @@ class BinanceBot:
                     # ... (omitted for brevity)
 
                 else:
-                    logger.info(f"No open positions for {self.config.symbol}. Drawing grid...")
-                    await self.draw_grid()
+                    wait = GRID_CHECK_INTERVAL
+                    current_price = await self.get_mark_price()
+                    if current_price is not None and self._grid_needs_redraw(current_price):
+                        logger.debug("No open positions for %s. Drawing grid...", self.config.symbol)
+                        await self.redraw_grid(current_price)
 
-                await asyncio.sleep(1)  # Reduced sleep for higher frequency
+                # Sleep until the user data stream reports a position change (or the next grid check while flat)
+                try:
+                    await asyncio.wait_for(self._position_event.wait(), timeout=wait)
+                    self._position_event.clear()
+                except asyncio.TimeoutError:
+                    pass
             except BinanceAPIException as e:
                 logger.error(f"Binance API Error in monitor_position: {e}")
                 await asyncio.sleep(1)
@@ -416,52 +972,105 @@ class BinanceBot:
                 logger.error(f"Exception in monitor_position: {e}")
                 await asyncio.sleep(1)
 
+    def _grid_needs_redraw(self, current_price: float) -> bool:
+        """
+        Check whether the grid has to be (re)drawn for the given mark price.
+
+        Args:
+            current_price (float): Current mark price.
+
+        Returns:
+            bool: True if no grid is resting or the price has moved beyond the outermost grid level.
+        """
+        if self._grid_center_ticks is None or not self.active_orders:
+            return True
+        return abs(self._to_ticks(current_price) - self._grid_center_ticks) > self.config.num_of_grids
+
+    def _set_pnl_row(self, *values: str):
+        """
+        Overwrite the cells of the PnL table row after the symbol column.
+
+        Args:
+            *values (str): Position, entry price, mark price, unrealized PnL, PnL % and net PnL.
+        """
+        for cells, value in zip(self._pnl_cells[1:], values):
+            cells[0] = value
+
     async def monitor_pnl(self):
         """
         Monitor net PnL and display in real time using rich library.
-        """
-        with Live(self.table, refresh_per_second=2, console=self.console):
+
+        Reads the same stream-fed position_state as monitor_position. The row is recomputed on every
+        position update and at least once a second for the mark price, and only re-rendered when a
+        displayed value changes, at most once per PNL_REFRESH_INTERVAL. When stdout is not a terminal,
+        each change is logged as one plain line instead of driving a Rich Live display.
+        """
+        # Bind everything the loop touches to locals once
+        symbol = self.config.symbol
+        get_mark_price = self._mark_prices.get
+        set_pnl_row = self._set_pnl_row
+        wait_for = asyncio.wait_for
+        monotonic = time.monotonic
+        pnl_event = self._pnl_event
+        _abs, _str, _format = abs, str, format
+
+        last_row = None
+        last_drawn = 0.0
+        use_live = self.console.is_terminal
+
+        with (Live(self.table, auto_refresh=False, console=self.console) if use_live else contextlib.nullcontext()) as live:
             while True:
                 try:
-                    positions = await self.client.futures_position_information(symbol=self.config.symbol)
-                    position_found = False
-                    for position in positions:
-                        if position['symbol'] == self.config.symbol:
-                            position_amt = float(position['positionAmt'])
-                            if position_amt != 0:
-                                entry_price = float(position['entryPrice'])
-                                mark_price = float(position['markPrice'])
-                                unrealized_pnl = float(position['unRealizedProfit'])
-                                pnl_percent = (unrealized_pnl / (entry_price * abs(position_amt))) * 100
-
-                                # Update the table
-                                self.table.rows = []
-                                self.table.add_row(
-                                    self.config.symbol,
-                                    f"{position_amt}",
-                                    f"{entry_price}",
-                                    f"{mark_price}",
-                                    f"{unrealized_pnl:.4f}",
-                                    f"{pnl_percent:.2f}%",
-                                    f"{unrealized_pnl:.4f}"
-                                )
-                                position_found = True
-                                break  # Exit the loop since we found the position
-
-                    if not position_found:
-                        # No position found for this symbol
-                        self.table.rows = []
-                        self.table.add_row(
-                            self.config.symbol,
-                            "0",
-                            "-",
-                            "-",
-                            "-",
-                            "-",
-                            "-"
+                    # Position comes from the user data stream cache, mark price from the markPrice stream
+                    # (position_state is replaced on every ACCOUNT_UPDATE, so it is re-read each pass)
+                    position = self.position_state
+                    position_amt = position['positionAmt']
+                    if position_amt != 0:
+                        entry_price = position['entryPrice']
+                        mark_price = get_mark_price(symbol)
+                        if mark_price is not None:
+                            unrealized_pnl = (mark_price - entry_price) * position_amt
+                        else:
+                            # No mark price pushed yet; use the PnL reported with the last account update
+                            mark_price = entry_price
+                            unrealized_pnl = position['unRealizedProfit']
+                        pnl_percent = (unrealized_pnl / (entry_price * _abs(position_amt))) * 100
+
+                        pnl = _format(unrealized_pnl, ".4f")
+                        row = (
+                            _str(position_amt),
+                            _str(entry_price),
+                            _str(mark_price),
+                            pnl,
+                            _format(pnl_percent, ".2f") + "%",
+                            pnl
                         )
-
-                    await asyncio.sleep(1)
+                    else:
+                        # No open position for this symbol
+                        row = ("0", "-", "-", "-", "-", "-")
+
+                    timeout = 1
+                    if row != last_row:
+                        now = monotonic()
+                        if now - last_drawn >= PNL_REFRESH_INTERVAL:
+                            if use_live:
+                                # Update the table row in place and redraw
+                                set_pnl_row(*row)
+                                live.refresh()
+                            else:
+                                logger.info("%s position=%s entry=%s mark=%s uPnL=%s (%s) net=%s", symbol, *row)
+                            last_row = row
+                            last_drawn = now
+                        else:
+                            # Drawn too recently; come back for the latest row once the interval is up
+                            timeout = PNL_REFRESH_INTERVAL - (now - last_drawn)
+
+                    # Wake on the next position update, or after 1s to pick up the latest mark price
+                    try:
+                        await wait_for(pnl_event.wait(), timeout=timeout)
+                        pnl_event.clear()
+                    except asyncio.TimeoutError:
+                        pass
                 except Exception as e:
                     logger.error(f"Error in monitor_pnl: {e}")
                     await asyncio.sleep(1)
@@ -472,25 +1081,138 @@ class BinanceBot:
         """
         await self.initialize_client()
         try:
-            await asyncio.gather(
-                self.monitor_position(),
-                self.monitor_orders(),  # Start order monitoring concurrently
-                self.monitor_pnl()  # Start PnL monitoring
-            )
+            # If any task fails, the TaskGroup cancels the others instead of leaving them on stale state
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._user_stream_loop())
+                tg.create_task(self.monitor_position())
+                tg.create_task(self.monitor_orders())  # Start order monitoring concurrently
+                tg.create_task(self.monitor_pnl())  # Start PnL monitoring
+        except* Exception as eg:
+            # Log each failed task on its own rather than the wrapping ExceptionGroup
+            for e in eg.exceptions:
+                logger.error(f"Task failed in run for {self.config.symbol}: {e!r}")
+        # The shared client is closed by main() once every bot has stopped
+
+# -----------------------------
+# Shared Market Data
+# -----------------------------
+
+MARK_PRICES: Dict[str, float] = {}  # symbol -> latest mark price, shared by every bot
+MARK_PRICE_TIMES: Dict[str, float] = {}  # symbol -> time.monotonic() when that mark price arrived
+EXCHANGE_FILTERS: Dict[str, Dict[str, dict]] = {}  # symbol -> filterType -> filter, shared by every bot
+
+async def load_exchange_filters(client: AsyncClient, filters: Dict[str, Dict[str, dict]] = EXCHANGE_FILTERS):
+    """
+    Fetch exchange info once and index every symbol's filters by filter type.
+
+    Args:
+        client (AsyncClient): Client used for the exchangeInfo request.
+        filters (Dict[str, Dict[str, dict]]): Mapping to fill; defaults to the shared EXCHANGE_FILTERS.
+    """
+    await WEIGHT_LIMITER.acquire(1)
+    exchange_info = await client.futures_exchange_info()
+    for symbol_info in exchange_info['symbols']:
+        filters[symbol_info['symbol']] = {f['filterType']: f for f in symbol_info['filters']}
+
+async def stream_mark_prices(client: AsyncClient, symbols: List[str]):
+    """
+    Keep MARK_PRICES updated for all symbols from a single combined <symbol>@markPrice@1s stream.
+
+    Args:
+        client (AsyncClient): Client used to open the WebSocket connection.
+        symbols (List[str]): Symbols traded by the bots.
+    """
+    bsm = BinanceSocketManager(client)
+    streams = [f"{symbol.lower()}@markPrice@1s" for symbol in symbols]
+    while True:
+        try:
+            async with bsm.futures_multiplex_socket(streams) as stream:
+                while True:
+                    msg = await stream.recv()
+                    data = msg.get('data', msg)  # Combined-stream frames wrap the payload in 'data'
+                    if data.get('e') == 'error':
+                        raise BinanceRequestException(data.get('m', 'mark price stream error'))
+                    symbol = data['s']
+                    MARK_PRICES[symbol] = float(data['p'])
+                    MARK_PRICE_TIMES[symbol] = time.monotonic()
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"Exception in run: {e}")
-        finally:
-            if self.client:
-                await self.client.close_connection()
-                logger.info(f"Closed Binance client for {self.config.symbol}")
+            logger.error(f"Error in mark price stream: {e}")
+            await asyncio.sleep(1)  # Reconnect after a short pause
+
+# -----------------------------
+# Process Tuning
+# -----------------------------
+
+def pin_to_cpu(cpu: int):
+    """
+    Pin the event-loop thread to a single CPU and switch it to real-time FIFO scheduling.
+
+    SCHED_FIFO needs root or the CAP_SYS_NICE capability
+    (e.g. `sudo setcap cap_sys_nice+ep $(readlink -f $(which python3))`).
+    Without it the bot stays pinned and falls back to the highest nice priority it is allowed.
+
+    Args:
+        cpu (int): Index of the CPU to run on; ideally one isolated from other workloads (isolcpus).
+    """
+    try:
+        os.sched_setaffinity(0, {cpu})
+        logger.info(f"Pinned event loop to CPU {cpu}")
+    except (AttributeError, OSError) as e:
+        # AttributeError: sched_* is unavailable outside Linux
+        logger.warning(f"Could not pin event loop to CPU {cpu}: {e}")
+        return
+
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(50))
+        logger.info("Event loop running with SCHED_FIFO priority 50")
+    except PermissionError:
+        logger.warning("SCHED_FIFO requires CAP_SYS_NICE; keeping the default scheduler.")
+        try:
+            os.nice(-20)
+            logger.info("Raised process priority to nice -20")
+        except PermissionError:
+            pass  # Negative nice values need the same capability
+
+def fast_loop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """
+    Pick uvloop (Linux/macOS) or winloop (Windows) as the event loop implementation.
+
+    Both are libuv-based drop-in loops with a faster scheduler and socket/SSL handling.
+    Install with `pip install uvloop` or, on Windows, `pip install winloop`.
+    The factory is passed to asyncio.Runner, which avoids the event loop policy API
+    (uvloop.install()) that newer Python and uvloop releases deprecate.
+
+    There is no maintained io_uring-backed asyncio loop to swap in, and the bot only holds a handful
+    of long-lived sockets, where epoll readiness costs one syscall per wakeup. Without uvloop/winloop
+    the default loop is used, with the platform's best selector (epoll on Linux, kqueue on macOS).
+
+    Returns:
+        Optional[Callable[[], asyncio.AbstractEventLoop]]: Loop factory, or None for the default asyncio loop.
+    """
+    try:
+        if sys.platform == 'win32':
+            import winloop as fast_loop
+        else:
+            import uvloop as fast_loop
+    except ImportError:
+        logger.info(f"uvloop/winloop not installed; using the default asyncio event loop "
+                    f"({selectors.DefaultSelector.__name__}).")
+        return None
+    logger.info(f"Using {fast_loop.__name__} event loop")
+    return fast_loop.new_event_loop
 
 # -----------------------------
 # Main Function to Run Bots
 # -----------------------------
 
-async def main():
+async def main(pin_cpu: Optional[int] = None):
     """
     Main function to initialize and run multiple BinanceBots concurrently based on the configuration.
+
+    Args:
+        pin_cpu (Optional[int]): CPU to pin the event loop to; overrides BotConfig.pin_cpu when given.
     """
     # Define the configurations for each bot directly within the script
     bot_configs = [
@@ -519,21 +1241,58 @@ async def main():
         # Add more BotConfig instances here for additional bots
     ]
 
-    bots = [BinanceBot(config) for config in bot_configs]  # Initialize each bot
+    # All bots share this event loop, so the first configured CPU applies to the whole process
+    if pin_cpu is None:
+        pin_cpu = next((config.pin_cpu for config in bot_configs if config.pin_cpu is not None), None)
+    if pin_cpu is not None:
+        pin_to_cpu(pin_cpu)
+
+    # One client, and one pooled aiohttp session, shared by every bot
+    client = await FastJsonAsyncClient.create(
+        api_key=k.binance_testnet_api_key,
+        api_secret=k.binance_testnet_api_secret,
+        tld='com',  # Top-level domain (change if using a different Binance domain)
+        testnet=bot_configs[0].testnet,  # Use testnet if specified
+        session_params={'connector': make_connector()},
+    )
+    logger.info("Initialized shared Binance client")
 
-    # Run all bots concurrently
-    await asyncio.gather(*(bot.run() for bot in bots))
+    # Everything after the client exists runs inside the try, so a failure still closes its session
+    try:
+        # Exchange info is large; fetch it once for every bot instead of once per bot
+        await load_exchange_filters(client)
+
+        bots = [BinanceBot(config, client) for config in bot_configs]  # Initialize each bot
+
+        async with asyncio.TaskGroup() as tg:
+            # One connection streams mark prices for every symbol
+            tg.create_task(stream_mark_prices(client, [config.symbol for config in bot_configs]))
+            # Run all bots concurrently
+            for bot in bots:
+                tg.create_task(bot.run())
+    except* Exception as eg:
+        for e in eg.exceptions:
+            logger.error(f"Task failed in main: {e!r}")
+    finally:
+        # Closes the aiohttp session and its pooled TLS connections
+        await client.close_connection()
+        logger.info("Closed shared Binance client")
 
 # -----------------------------
 # Entry Point
 # -----------------------------
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Binance Futures HFT market maker")
+    parser.add_argument("--pin-cpu", type=int, default=None, metavar="CPU",
+                        help="pin the event loop to this CPU (Linux only), ideally one reserved with isolcpus")
+    args = parser.parse_args()
     try:
         # Start the asyncio event loop and run the main function
         logger.info("Starting Binance trading bots...")
         print("INFO: Starting Binance trading bots...")
-        asyncio.run(main())
+        with asyncio.Runner(loop_factory=fast_loop_factory()) as runner:
+            runner.run(main(pin_cpu=args.pin_cpu))
     except KeyboardInterrupt:
         # Handle user-initiated interruption (e.g., Ctrl+C)
         logger.info("Bot terminated by user.")
@@ -554,12 +1313,14 @@ if __name__ == '__main__' and 'test' in __name__:
 
     # Define the Test Suite here
     import unittest
-from unittest.mock import AsyncMock, patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock, ANY
 import asyncio
+import json
+import time
 
 # Import the BinanceBot and BotConfig classes from your main script
 # Adjust the import according to your actual file structure
-from binance_hft_market_maker import BinanceBot, BotConfig
+from binance_hft_market_maker import BinanceBot, BotConfig, OrderRow
 
 class TestBinanceBot(unittest.IsolatedAsyncioTestCase):
     """
@@ -584,37 +1345,45 @@ class TestBinanceBot(unittest.IsolatedAsyncioTestCase):
         )
         # Instantiate the BinanceBot with the test config
         self.bot = BinanceBot(self.config)
+        self.bot._exchange_filters = {}  # Don't share exchange info between tests
         # Mock the console to prevent actual console output during tests
         self.bot.console = MagicMock()
 
-    @patch('bot.AsyncClient.create')
-    async def test_initialize_client_success(self, mock_create):
+    async def test_initialize_client_success(self):
         """
         Test successful client initialization.
         """
-        # Mock the client creation
-        mock_create.return_value = AsyncMock()
+        # Inject the shared client
+        self.bot.client = AsyncMock()
+        self.bot.client.futures_exchange_info.return_value = {
+            'symbols': [{'symbol': 'BTCUSDT', 'filters': [{'filterType': 'PRICE_FILTER', 'tickSize': '0.1'}]}]
+        }
+        self.bot.client.futures_position_information.return_value = [
+            {'symbol': 'BTCUSDT', 'positionAmt': '0', 'entryPrice': '0'}
+        ]
         await self.bot.initialize_client()
-        self.assertIsNotNone(self.bot.client)
-        mock_create.assert_called_once()
+        self.assertIs(self.bot._sess, self.bot.client.session)
+        self.bot.client.futures_change_leverage.assert_awaited_once()
+        self.assertEqual(self.bot.tick_size, 0.1)
 
-    @patch('bot.AsyncClient.create', side_effect=Exception('API Error'))
-    async def test_initialize_client_failure(self, mock_create):
+    async def test_initialize_client_failure(self):
         """
         Test client initialization failure.
         """
+        self.bot.client = AsyncMock()
+        self.bot.client.futures_exchange_info.side_effect = Exception('API Error')
         with self.assertRaises(SystemExit):
             await self.bot.initialize_client()
-        mock_create.assert_called_once()
 
     # Test get_tick_size method
-    @patch('bot.AsyncClient.futures_exchange_info')
-    async def test_get_tick_size_success(self, mock_exchange_info):
+    async def test_get_tick_size_success(self):
         """
         Test successful retrieval of tick size.
         """
+        # Mock the client
+        self.bot.client = AsyncMock()
         # Mock the exchange info response
-        mock_exchange_info.return_value = {
+        self.bot.client.futures_exchange_info.return_value = {
             'symbols': [
                 {
                     'symbol': 'BTCUSDT',
@@ -624,10 +1393,44 @@ class TestBinanceBot(unittest.IsolatedAsyncioTestCase):
                 }
             ]
         }
-        # Mock the client
+        await self.bot.get_tick_size()
+        self.assertEqual(self.bot.tick_size, 0.1)
+        self.assertEqual(self.bot._price_fmt, '%.1f')
+
+    async def test_get_tick_size_preloaded(self):
+        """
+        Test that preloaded exchange filters are used without another exchangeInfo request.
+        """
         self.bot.client = AsyncMock()
+        self.bot._exchange_filters = {'BTCUSDT': {'PRICE_FILTER': {'filterType': 'PRICE_FILTER', 'tickSize': '0.10'}}}
         await self.bot.get_tick_size()
         self.assertEqual(self.bot.tick_size, 0.1)
+        self.bot.client.futures_exchange_info.assert_not_awaited()
+
+    # Test tick conversion helpers
+    def test_tick_conversion(self):
+        """
+        Test that prices snap to the nearest tick and convert back without float drift.
+        """
+        self.bot.tick_size = 0.1
+        self.bot._tick_int = 10_000_000
+        self.bot._inv_tick = 10.0
+        self.assertEqual(self.bot._to_ticks(50000.3 - 0.1), 500002)
+        self.assertEqual(self.bot._to_ticks(50000.04), 500000)
+        self.assertEqual(self.bot._to_ticks(50000.06), 500001)
+        self.assertEqual(self.bot._tick_price(500002), 50000.2)
+
+    def test_tick_conversion_matches_decimal(self):
+        """
+        Test that the reciprocal multiply rounds every price like exact decimal division would.
+        """
+        from decimal import Decimal, ROUND_HALF_UP
+        for tick_size, start in (('0.1', 49990), ('0.01', 1990)):
+            self.bot._tick_int = int(Decimal(tick_size) * self.bot._scale)
+            self.bot._inv_tick = self.bot._scale / self.bot._tick_int
+            for price in (round(start + i * 0.003, 3) for i in range(5000)):
+                expected = (Decimal(repr(price)) / Decimal(tick_size)).to_integral_value(ROUND_HALF_UP)
+                self.assertEqual(self.bot._to_ticks(price), int(expected), price)
 
     @patch('bot.AsyncClient.futures_exchange_info', side_effect=Exception('API Error'))
     async def test_get_tick_size_failure(self, mock_exchange_info):
@@ -663,52 +1466,58 @@ class TestBinanceBot(unittest.IsolatedAsyncioTestCase):
         mock_change_leverage.assert_called_once()
 
     # Test get_position_direction method
-    @patch('bot.AsyncClient.futures_position_information')
-    async def test_get_position_direction_long(self, mock_position_info):
+    async def test_get_position_direction_long(self):
         """
         Test getting position direction when long.
         """
-        mock_position_info.return_value = [{'symbol': 'BTCUSDT', 'positionAmt': '0.01'}]
-        # Mock the client
-        self.bot.client = AsyncMock()
+        self.bot.position_state['positionAmt'] = 0.01
         direction = await self.bot.get_position_direction()
         self.assertEqual(direction, 'LONG')
 
-    @patch('bot.AsyncClient.futures_position_information')
-    async def test_get_position_direction_short(self, mock_position_info):
+    async def test_get_position_direction_short(self):
         """
         Test getting position direction when short.
         """
-        mock_position_info.return_value = [{'symbol': 'BTCUSDT', 'positionAmt': '-0.01'}]
-        # Mock the client
-        self.bot.client = AsyncMock()
+        self.bot.position_state['positionAmt'] = -0.01
         direction = await self.bot.get_position_direction()
         self.assertEqual(direction, 'SHORT')
 
-    @patch('bot.AsyncClient.futures_position_information')
-    async def test_get_position_direction_flat(self, mock_position_info):
+    async def test_get_position_direction_flat(self):
         """
         Test getting position direction when flat.
         """
-        mock_position_info.return_value = [{'symbol': 'BTCUSDT', 'positionAmt': '0'}]
-        # Mock the client
-        self.bot.client = AsyncMock()
+        self.bot.position_state['positionAmt'] = 0.0
         direction = await self.bot.get_position_direction()
         self.assertEqual(direction, 'FLAT')
 
     # Test get_mark_price method
-    @patch('bot.AsyncClient.futures_mark_price')
+    @patch('bot.BinanceBot._fapi_request')
     async def test_get_mark_price_success(self, mock_mark_price):
         """
         Test successful retrieval of mark price.
         """
-        mock_mark_price.return_value = {'markPrice': '50000'}
+        mock_mark_price.return_value = b'{"symbol":"BTCUSDT","markPrice":"50000","indexPrice":"49990"}'
         # Mock the client
         self.bot.client = AsyncMock()
         price = await self.bot.get_mark_price()
         self.assertEqual(price, 50000.0)
 
-    @patch('bot.AsyncClient.futures_mark_price', side_effect=Exception('API Error'))
+    @patch('bot.BinanceBot._fapi_request')
+    async def test_get_mark_price_from_stream(self, mock_mark_price):
+        """
+        Test that a fresh streamed mark price is served without REST, and a stale one is refreshed.
+        """
+        mock_mark_price.return_value = b'{"symbol":"BTCUSDT","markPrice":"50200"}'
+        self.bot._mark_prices = {'BTCUSDT': 50100.0}
+        self.bot._mark_price_times = {'BTCUSDT': time.monotonic()}
+        self.assertEqual(await self.bot.get_mark_price(), 50100.0)
+        mock_mark_price.assert_not_called()
+
+        self.bot._mark_price_times = {'BTCUSDT': time.monotonic() - 60}
+        self.assertEqual(await self.bot.get_mark_price(), 50200.0)
+        mock_mark_price.assert_called_once()
+
+    @patch('bot.BinanceBot._fapi_request', side_effect=Exception('API Error'))
     async def test_get_mark_price_failure(self, mock_mark_price):
         """
         Test failure to retrieve mark price.
@@ -718,47 +1527,50 @@ class TestBinanceBot(unittest.IsolatedAsyncioTestCase):
         price = await self.bot.get_mark_price()
         self.assertIsNone(price)
 
-    # Test place_limit_order method
-    @patch('bot.AsyncClient.futures_create_order')
-    async def test_place_limit_order_success(self, mock_create_order):
+    # Test flush_pending_orders method
+    @patch('bot.BinanceBot._fapi_request')
+    async def test_flush_pending_orders(self, mock_fapi_request):
         """
-        Test successful placement of a limit order.
+        Test that queued orders go out as one batchOrders request and only accepted ones are tracked.
         """
-        mock_create_order.return_value = {'orderId': 12345}
-        # Mock the client
-        self.bot.client = AsyncMock()
-        order = await self.bot.place_limit_order('BUY', 0.002, 50000)
-        self.assertIsNotNone(order)
-        self.assertEqual(order['orderId'], 12345)
-        mock_create_order.assert_called_once()
-
-    @patch('bot.AsyncClient.futures_create_order', side_effect=Exception('API Error'))
-    async def test_place_limit_order_failure(self, mock_create_order):
-        """
-        Test failure to place a limit order.
-        """
-        # Mock the client
-        self.bot.client = AsyncMock()
-        order = await self.bot.place_limit_order('BUY', 0.002, 50000)
-        self.assertIsNone(order)
-        mock_create_order.assert_called_once()
+        mock_fapi_request.return_value = [{'orderId': 1}, {'code': -2019, 'msg': 'Margin is insufficient.'}]
+        self.bot._price_fmt = '%.1f'
+        self.bot._tick_int = 10_000_000
+        self.bot.queue_limit_order('BUY', 0.002, 499999)
+        self.bot.queue_limit_order('SELL', 0.002, 500001)
+        await self.bot.flush_pending_orders()
+        method, path, params = mock_fapi_request.call_args.args
+        self.assertEqual((method, path), ('POST', '/fapi/v1/batchOrders'))
+        self.assertEqual([order['price'] for order in json.loads(params['batchOrders'])], ['49999.9', '50000.1'])
+        self.assertEqual(self.bot.active_orders, {1: OrderRow('BUY', 499999)})
+        self.assertEqual(self.bot._pending_batch, [])
 
     # Test cancel_orders method
-    @patch('bot.AsyncClient.futures_get_open_orders')
-    @patch('bot.AsyncClient.futures_cancel_order')
-    async def test_cancel_orders(self, mock_cancel_order, mock_get_open_orders):
+    @patch('bot.BinanceBot._fapi_request')
+    async def test_cancel_orders(self, mock_fapi_request):
         """
         Test successful cancellation of orders.
         """
-        mock_get_open_orders.return_value = [{'orderId': 12345, 'side': 'BUY'}]
+        mock_fapi_request.return_value = {'code': 200, 'msg': 'success'}
         # Mock the client
         self.bot.client = AsyncMock()
-        self.bot.active_orders = {12345: {'side': 'BUY', 'price': 50000}}
+        self.bot.active_orders = {12345: OrderRow('BUY', 500000)}
         await self.bot.cancel_orders()
-        mock_get_open_orders.assert_called_once()
-        mock_cancel_order.assert_called_once_with(symbol=self.config.symbol, orderId=12345)
+        mock_fapi_request.assert_called_once_with('DELETE', '/fapi/v1/allOpenOrders', {'symbol': self.config.symbol})
         self.assertEqual(self.bot.active_orders, {})
 
+    @patch('bot.BinanceBot._fapi_request')
+    async def test_cancel_orders_by_side(self, mock_fapi_request):
+        """
+        Test that one-sided cancellation batches the matching order ids.
+        """
+        mock_fapi_request.return_value = [{'orderId': 1}, {'orderId': 3}]
+        self.bot.active_orders = {1: OrderRow('BUY', 500000), 2: OrderRow('SELL', 501000), 3: OrderRow('BUY', 499000)}
+        await self.bot.cancel_orders(side='BUY')
+        # Ids come from active_orders; open orders are not re-fetched
+        mock_fapi_request.assert_called_once_with('DELETE', '/fapi/v1/batchOrders', {'symbol': self.config.symbol, 'orderIdList': '[1,3]'})
+        self.assertEqual(list(self.bot.active_orders), [2])
+
     # Test calculate_take_profit_level method
     @patch('bot.AsyncClient.futures_position_information')
     async def test_calculate_take_profit_level_long(self, mock_position_info):
@@ -794,42 +1606,170 @@ class TestBinanceBot(unittest.IsolatedAsyncioTestCase):
         self.assertIsNone(tp_quantity)
 
     # Test monitor_pnl method (simplified)
-    @patch('bot.AsyncClient.futures_position_information')
-    async def test_monitor_pnl(self, mock_position_info):
+    async def test_monitor_pnl(self):
         """
         Test monitor_pnl method.
         """
-        mock_position_info.return_value = [{
-            'symbol': 'BTCUSDT',
-            'positionAmt': '0.002',
-            'entryPrice': '50000',
-            'markPrice': '50100',
-            'unRealizedProfit': '200'
-        }]
-        # Mock the client
-        self.bot.client = AsyncMock()
+        self.bot.position_state = {'positionAmt': 0.002, 'entryPrice': 50000.0, 'unRealizedProfit': 0.2}
+        self.bot._mark_prices = {'BTCUSDT': 50100.0}
         # Run monitor_pnl for a short duration
         async def run_monitor_pnl():
             await asyncio.wait_for(self.bot.monitor_pnl(), timeout=1)
         with self.assertRaises(asyncio.TimeoutError):
             await run_monitor_pnl()
-        # Ensure that table rows have been updated
-        self.assertTrue(self.bot.table.rows)
+        # Ensure that the single table row has been updated in place
+        # (the mocked console reports a terminal, so the Live table is used)
+        self.assertEqual(self.bot.table.row_count, 1)
+        self.assertEqual(self.bot.table.columns[4]._cells[0], "0.2000")
+
+    # Test reconcile_orders method
+    @patch('bot.BinanceBot._fapi_request')
+    async def test_reconcile_orders(self, mock_fapi_request):
+        """
+        Test that tracked orders missing from the open orders snapshot are replaced only if they filled.
+        """
+        async def fake_request(method, path, params, **kwargs):
+            if path == '/fapi/v1/openOrders':
+                return [{'orderId': 2, 'side': 'SELL'}]
+            return {'orderId': params['orderId'], 'status': 'FILLED' if params['orderId'] == 1 else 'CANCELED'}
+        mock_fapi_request.side_effect = fake_request
+        self.bot._tick_int = 10_000_000
+        self.bot.active_orders = {1: OrderRow('BUY', 499999), 2: OrderRow('SELL', 500001), 3: OrderRow('SELL', 500002)}
+        await self.bot.reconcile_orders()
+        self.assertEqual(list(self.bot.active_orders), [2])
+        # The filled BUY is replaced one tick lower; the cancelled SELL is only dropped
+        self.assertEqual([(ticks, params['side']) for ticks, params in self.bot._pending_batch], [(499998, 'BUY')])
+        self.assertTrue(self.bot._order_event.is_set())
+
+    # Test reconcile_orders with an order placed while the request is in flight
+    @patch('bot.BinanceBot._fapi_request')
+    async def test_reconcile_orders_ignores_orders_placed_in_flight(self, mock_fapi_request):
+        """
+        Test that an order tracked after the open orders snapshot was requested is not taken as a fill.
+        """
+        self.bot._tick_int = 10_000_000
+        self.bot.active_orders = {1: OrderRow('BUY', 499999)}
+
+        async def open_orders(*args, **kwargs):
+            # A redraw places order 2 after the exchange has already answered without it
+            self.bot.active_orders[2] = OrderRow('SELL', 500001)
+            return [{'orderId': 1, 'side': 'BUY'}]
+
+        mock_fapi_request.side_effect = open_orders
+        await self.bot.reconcile_orders()
+        self.assertEqual(list(self.bot.active_orders), [1, 2])
+        self.assertEqual(self.bot._pending_batch, [])
+
+    # Test sync_position method
+    async def test_sync_position_dedupes_snapshots(self):
+        """
+        Test that overlapping position syncs share one symbol-scoped request and both wait for it.
+        """
+        async def slow_position_information(**kwargs):
+            await asyncio.sleep(0.05)
+            return [{'symbol': 'BTCUSDT', 'positionAmt': '0.002', 'entryPrice': '50000', 'unRealizedProfit': '0.1'}]
+
+        self.bot.client = AsyncMock()
+        self.bot.client.futures_position_information.side_effect = slow_position_information
+
+        async def sync_and_read():
+            await self.bot.sync_position()
+            return self.bot.position_state['positionAmt']
+
+        # Neither caller may return before the snapshot has landed
+        self.assertEqual(await asyncio.gather(sync_and_read(), sync_and_read()), [0.002, 0.002])
+        self.bot.client.futures_position_information.assert_awaited_once_with(symbol='BTCUSDT')
+        self.assertEqual(self.bot.position_state['positionAmt'], 0.002)
+
+    # Test user data stream dispatch
+    async def test_handle_user_event(self):
+        """
+        Test that user data stream events update the position and order caches.
+        """
+        self.bot._tick_int = 10_000_000
+        self.bot.active_orders = {1: OrderRow('BUY', 499999), 2: OrderRow('SELL', 500001)}
+        self.bot._handle_user_event({'e': 'ACCOUNT_UPDATE', 'a': {'P': [
+            {'s': 'BTCUSDT', 'pa': '0.002', 'ep': '49999.9', 'up': '0.01'}
+        ]}})
+        self.bot._handle_user_event({'e': 'ORDER_TRADE_UPDATE', 'o': {
+            's': 'BTCUSDT', 'o': 'LIMIT', 'i': 1, 'S': 'BUY', 'X': 'FILLED', 'p': '49999.9'
+        }})
+        self.bot._handle_user_event({'e': 'ORDER_TRADE_UPDATE', 'o': {
+            's': 'BTCUSDT', 'o': 'LIMIT', 'i': 2, 'S': 'SELL', 'X': 'CANCELED', 'p': '50000.1'
+        }})
+        self.assertEqual(self.bot.position_state['positionAmt'], 0.002)
+        # The fill is replaced one tick further out straight from the event
+        self.assertEqual([ticks for ticks, _ in self.bot._pending_batch], [499998])
+        self.assertEqual(self.bot.active_orders, {})
+        # Both monitor loops are woken
+        self.assertTrue(self.bot._position_event.is_set())
+        self.assertTrue(self.bot._pnl_event.is_set())
+        self.assertTrue(self.bot._order_event.is_set())
 
     # Test draw_grid method
     @patch('bot.BinanceBot.get_mark_price', return_value=50000.0)
-    @patch('bot.BinanceBot.place_limit_order', return_value={'orderId': 12345})
-    async def test_draw_grid(self, mock_place_limit_order, mock_get_mark_price):
+    @patch('bot.BinanceBot._fapi_request')
+    async def test_draw_grid(self, mock_fapi_request, mock_get_mark_price):
         """
         Test the draw_grid method.
         """
+        order_ids = iter(range(1, 100))
+        async def fake_batch(method, path, params, **kwargs):
+            return [{'orderId': next(order_ids)} for _ in json.loads(params['batchOrders'])]
+        mock_fapi_request.side_effect = fake_batch
         self.bot.tick_size = 0.1
+        self.bot._tick_int = 10_000_000
+        self.bot._inv_tick = 10.0
         await self.bot.draw_grid()
-        # Check that place_limit_order was called the correct number of times
-        expected_calls = (self.config.num_of_grids * 2)  # For BUY and SELL orders
-        self.assertEqual(mock_place_limit_order.call_count, expected_calls)
+        # Orders go out in batches of 5
+        expected_orders = (self.config.num_of_grids * 2)  # For BUY and SELL orders
+        self.assertEqual(mock_fapi_request.call_count, -(-expected_orders // 5))
         # Check that active_orders dictionary is populated
-        self.assertEqual(len(self.bot.active_orders), expected_calls)
+        self.assertEqual(len(self.bot.active_orders), expected_orders)
+        ticks = sorted(row.ticks for row in self.bot.active_orders.values())
+        self.assertEqual(ticks[0], 499995)
+        self.assertEqual(ticks[-1], 500005)
+
+    @patch('bot.BinanceBot._fapi_request')
+    async def test_redraw_grid_drops_queued_replacements(self, mock_fapi_request):
+        """
+        Test that a fill replacement queued before a redraw is not sent along with the new grid.
+        """
+        async def fake_request(method, path, params, **kwargs):
+            if path == '/fapi/v1/batchOrders':
+                return [{'orderId': 100 + i} for i, _ in enumerate(json.loads(params['batchOrders']))]
+            return {'code': 200, 'msg': 'success'}
+        mock_fapi_request.side_effect = fake_request
+        self.bot.tick_size = 0.1
+        self.bot._tick_int = 10_000_000
+        self.bot._inv_tick = 10.0
+        self.bot._price_fmt = '%.1f'
+        self.bot.active_orders = {1: OrderRow('BUY', 499000), 2: OrderRow('SELL', 501000)}
+        self.bot._replace_filled(1)  # Queues a BUY at 499999 ticks for the old grid
+        await self.bot.redraw_grid(50000.0)
+        mock_fapi_request.assert_any_await('DELETE', '/fapi/v1/allOpenOrders', {'symbol': self.config.symbol})
+        posted = [order['price'] for call in mock_fapi_request.await_args_list if call.args[1] == '/fapi/v1/batchOrders'
+                  for order in json.loads(call.args[2]['batchOrders'])]
+        # Only the new grid's levels around 500000 ticks; no replacement at 499999 ticks on top of them
+        levels = range(1, self.config.num_of_grids + 1)
+        expected = ['%.1f' % ((500000 + sign * i) / 10) for i in levels for sign in (-1, 1)]
+        self.assertEqual(sorted(posted), sorted(expected))
+        self.assertEqual(posted.count('49999.9'), 1)
+        self.assertEqual(self.bot._pending_batch, [])
+
+    def test_grid_needs_redraw(self):
+        """
+        Test that a resting grid is only redrawn once the mark price moves past its outer levels.
+        """
+        self.bot._tick_int = 10_000_000
+        self.bot._inv_tick = 10.0
+        self.assertTrue(self.bot._grid_needs_redraw(50000.0))  # Nothing drawn yet
+        self.bot._grid_center_ticks = 500000
+        self.bot.active_orders = {1: OrderRow('BUY', 499999)}
+        self.assertFalse(self.bot._grid_needs_redraw(50000.5))  # 5 ticks away, still inside the grid
+        self.assertTrue(self.bot._grid_needs_redraw(50000.6))
+        self.bot.active_orders = {}
+        self.assertTrue(self.bot._grid_needs_redraw(50000.0))  # Grid fully filled or cancelled
 
     # Add more tests as necessary...
 
@@ -838,9 +1778,18 @@ class TestBinanceBot(unittest.IsolatedAsyncioTestCase):
         """
         End-to-end test of the bot's main functionality using mocks.
         """
-        with patch('bot.AsyncClient.create') as mock_create_client:
+        # Hot endpoints bypass the client and go through _fapi_request
+        rest_responses = {
+            '/fapi/v1/premiumIndex': b'{"symbol":"BTCUSDT","markPrice":"50100"}',
+            '/fapi/v1/batchOrders': [{'orderId': 12345}],
+        }
+        async def fake_fapi_request(method, path, params, **kwargs):
+            return rest_responses[path]
+
+        with patch('bot.BinanceBot._fapi_request', side_effect=fake_fapi_request) as mock_fapi_request:
+            # Inject the shared client
             mock_client = AsyncMock()
-            mock_create_client.return_value = mock_client
+            self.bot.client = mock_client
 
             # Mock necessary client methods
             mock_client.futures_exchange_info.return_value = {
@@ -854,11 +1803,8 @@ class TestBinanceBot(unittest.IsolatedAsyncioTestCase):
                 ]
             }
             mock_client.futures_change_leverage.return_value = {'leverage': self.config.leverage}
-            mock_client.futures_position_information.return_value = [{'symbol': 'BTCUSDT', 'positionAmt': '0.002', 'entryPrice': '50000'}]
-            mock_client.futures_mark_price.return_value = {'markPrice': '50100'}
-            mock_client.futures_create_order.return_value = {'orderId': 12345}
-            mock_client.futures_get_open_orders.return_value = []
-            mock_client.futures_cancel_order.return_value = {}
+            # Flat, so monitor_position reads the mark price and draws the grid
+            mock_client.futures_position_information.return_value = [{'symbol': 'BTCUSDT', 'positionAmt': '0', 'entryPrice': '0'}]
 
             # Mock the console
             self.bot.console = MagicMock()
@@ -870,7 +1816,6 @@ class TestBinanceBot(unittest.IsolatedAsyncioTestCase):
                 await run_bot()
 
             # Verify that the client was initialized
-            mock_create_client.assert_called_once()
             mock_client.futures_exchange_info.assert_awaited()
             mock_client.futures_change_leverage.assert_awaited()
 
@@ -878,10 +1823,10 @@ class TestBinanceBot(unittest.IsolatedAsyncioTestCase):
             self.assertTrue(mock_client.futures_position_information.await_count > 0)
 
             # Verify that get_mark_price was called
-            self.assertTrue(mock_client.futures_mark_price.await_count > 0)
+            mock_fapi_request.assert_any_await('GET', '/fapi/v1/premiumIndex', {'symbol': 'BTCUSDT'}, signed=False, raw=True)
 
             # Verify that orders were placed
-            self.assertTrue(mock_client.futures_create_order.await_count > 0)
+            mock_fapi_request.assert_any_await('POST', '/fapi/v1/batchOrders', ANY, weight=5, orders=ANY)
 
             # Add more assertions as necessary...
 
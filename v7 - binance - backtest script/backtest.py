@@ -1,18 +1,30 @@
 # -----------------------------
 # ATR Grid Strategy Backtester with Real Binance Data
 # -----------------------------
+import asyncio
 import pandas as pd
 import numpy as np
-import ccxt
+import ccxt.async_support as ccxt_async
 import key_file as k # <-- your file with API keys
 
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional: without it the kernels below run as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 # -----------------------------
 # Config
 # -----------------------------
 class Config:
     symbol = "BTC/USDT"       # Binance trading pair
     timeframe = "1m"          # "1m", "5m", "1h", "1d"
-    limit = 1500              # candles to fetch (max ~1500 per request with ccxt)
+    limit = 1500              # candles to fetch (split into several requests when above candles_per_request)
+    candles_per_request = 1000  # Binance spot klines return at most 1000 candles per request
+    max_concurrent_requests = 10  # requests in flight at once while fetching history
     initial_balance = 10000
     volume = 0.001
     grid_multiplier = 0.1
@@ -20,144 +32,266 @@ class Config:
     take_profit_percent = 0.5
     stop_loss_percent = 0.5
     atr_period = 14
+    atr_smoothing = "sma"     # "sma" (simple mean of the last atr_period TRs) or "wilder" (Wilder's RMA)
     risk_free_rate = 0.0
 
 # -----------------------------
 # Indicator: ATR
 # -----------------------------
-def calculate_atr(df, period=14):
-    df["H-L"] = df["high"] - df["low"]
-    df["H-C"] = abs(df["high"] - df["close"].shift())
-    df["L-C"] = abs(df["low"] - df["close"].shift())
-    df["TR"] = df[["H-L", "H-C", "L-C"]].max(axis=1)
-    df["ATR"] = df["TR"].rolling(period).mean()
+def true_range(high, low, close):
+    # Row-wise max of the three candidate ranges as two np.maximum calls on float64 arrays;
+    # from the second bar on the previous close is a view aligned one bar back
+    tr = high - low
+    prev_close = close[:-1]
+    tr[1:] = np.maximum(np.maximum(tr[1:], np.abs(high[1:] - prev_close)), np.abs(low[1:] - prev_close))
+    return tr
+
+@njit(cache=True)
+def _sma_kernel(tr, period):
+    # Simple moving average with a running window sum; NaN until a full window is available
+    n = len(tr)
+    atr = np.full(n, np.nan)
+    window_sum = 0.0
+    for i in range(n):
+        window_sum += tr[i]
+        if i >= period:
+            window_sum -= tr[i-period]
+        if i >= period - 1:
+            atr[i] = window_sum / period
+    return atr
+
+@njit(cache=True)
+def _wilder_rma(tr, period):
+    # Wilder's smoothing: seeded with the mean of the first `period` values, then
+    # out[i] = (out[i-1]*(period-1) + tr[i]) / period, which is serial and has to be a loop
+    n = len(tr)
+    out = np.full(n, np.nan)
+    if n < period:
+        return out
+    s = 0.0
+    for i in range(period):
+        s += tr[i]
+    out[period-1] = s / period
+    for i in range(period, n):
+        out[i] = (out[i-1] * (period - 1) + tr[i]) / period
+    return out
+
+def calculate_atr(df, period=14, smoothing="sma"):
+    tr = true_range(
+        df["high"].to_numpy(np.float64),
+        df["low"].to_numpy(np.float64),
+        df["close"].to_numpy(np.float64),
+    )
+    atr = _wilder_rma(tr, period) if smoothing == "wilder" else _sma_kernel(tr, period)
+    df["TR"] = tr
+    df["ATR"] = atr
     return df
 
 # -----------------------------
 # Metrics Helpers
 # -----------------------------
-def max_drawdown(equity_curve):
-    roll_max = np.maximum.accumulate(equity_curve)
-    dd = (equity_curve - roll_max) / roll_max
-    return dd.min()
+ANNUALIZATION = np.sqrt(252*24*60)  # per-minute returns
 
-def sharpe_ratio(returns, rf=0.0):
-    return 0 if returns.std() == 0 else (returns.mean() - rf) / returns.std() * np.sqrt(252*24*60)
+@njit(cache=True)
+def _equity_stats(equity_curve):
+    # Max drawdown and ulcer index from one forward pass: running peak, drawdown and its
+    # square are updated together instead of materialising roll_max/drawdown arrays twice
+    roll_max = equity_curve[0]
+    mdd = 0.0
+    sq_sum = 0.0
+    for x in equity_curve:
+        if x > roll_max:
+            roll_max = x
+        dd = (x - roll_max) / roll_max
+        if dd < mdd:
+            mdd = dd
+        sq_sum += dd * dd
+    return mdd, np.sqrt(sq_sum / len(equity_curve))
 
-def sortino_ratio(returns, rf=0.0):
-    downside = returns[returns < 0]
-    return 0 if downside.std() == 0 else (returns.mean() - rf) / downside.std() * np.sqrt(252*24*60)
+def _moments(x):
+    # Mean, sample std and pandas-compatible (bias-corrected) skewness and excess kurtosis
+    # from a single set of centred residuals, instead of a pass per statistic
+    n = len(x)
+    if n == 0:
+        return np.nan, np.nan, np.nan, np.nan
+    mean = x.mean()
+    d = x - mean
+    d2 = d * d
+    m2 = d2.sum()
+    m3 = (d2 * d).sum()
+    m4 = (d2 * d2).sum()
+    std = np.sqrt(m2 / (n - 1)) if n > 1 else np.nan
+    if n < 3:
+        skew = np.nan
+    else:
+        skew = 0.0 if m2 == 0 else (n * (n - 1) ** 0.5 / (n - 2)) * (m3 / m2 ** 1.5)
+    if n < 4:
+        kurt = np.nan
+    else:
+        kurt = 0.0 if m2 == 0 else (
+            n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2 ** 2)
+            - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+        )
+    return mean, std, skew, kurt
 
-def calmar_ratio(returns, equity_curve):
-    mdd = abs(max_drawdown(equity_curve))
-    return 0 if mdd == 0 else returns.mean() / mdd
+def compute_metrics(cfg, balance, trades, equity_curve, rf=0.0):
+    # Split the trades once and reuse the pieces (and the std) across every metric
+    n = len(trades)
+    wins = trades[trades > 0]
+    losses = trades[trades < 0]
+    mean, std, skew, kurt = _moments(trades)
+    downside_std = losses.std(ddof=1) if len(losses) > 1 else np.nan
+    mdd, ulcer = _equity_stats(equity_curve)
 
-def ulcer_index(equity_curve):
-    roll_max = np.maximum.accumulate(equity_curve)
-    drawdown = (equity_curve - roll_max) / roll_max
-    return np.sqrt(np.mean(drawdown**2))
+    return {
+        "Initial Balance": cfg.initial_balance,
+        "Final Balance": round(balance, 2),
+        "Total Return (%)": round(((balance - cfg.initial_balance)/cfg.initial_balance)*100, 2),
+        "Number of Trades": n,
+        "Win Rate (%)": round((len(wins)/n)*100,2) if n>0 else 0,
+        "Average Win": round(wins.mean(),2) if len(wins)>0 else 0,
+        "Average Loss": round(losses.mean(),2) if len(losses)>0 else 0,
+        "Max Win": round(trades.max(),2) if n>0 else 0,
+        "Max Loss": round(trades.min(),2) if n>0 else 0,
+        "Max Drawdown (%)": round(mdd*100,2),
+        "Ulcer Index": round(ulcer,4),
+        "Sharpe Ratio": (0 if std == 0 else round((mean - rf) / std * ANNUALIZATION,2)) if n>1 else 0,
+        "Sortino Ratio": (0 if downside_std == 0 else round((mean - rf) / downside_std * ANNUALIZATION,2)) if n>1 else 0,
+        "Calmar Ratio": (0 if mdd == 0 else round(mean / abs(mdd),2)) if n>1 else 0,
+        "Profit Factor": round(abs(wins.sum() / losses.sum()),2) if len(losses)>0 else np.inf,
+        "Expectancy": round(mean,2) if n>0 else 0,
+        "Std Dev of Returns": round(std,2) if n>0 else 0,
+        "Skewness": round(skew,2) if n>0 else 0,
+        "Kurtosis": round(kurt,2) if n>0 else 0
+    }
 
 # -----------------------------
 # Fetch Binance Data
 # -----------------------------
-import ccxt
-
-def fetch_data(cfg):
+async def fetch_ohlcv_async(cfg):
     # Use public API (no keys required)
-    exchange = ccxt.binance({
+    exchange = ccxt_async.binance({
         'enableRateLimit': True,
     })
+    try:
+        # Split the requested history into pages and fetch them concurrently, at most
+        # max_concurrent_requests at a time
+        step = exchange.parse_timeframe(cfg.timeframe) * 1000
+        end = exchange.milliseconds()
+        page_span = cfg.candles_per_request * step
+        starts = range(end - cfg.limit * step, end, page_span)
+        semaphore = asyncio.Semaphore(cfg.max_concurrent_requests)
+
+        async def fetch_page(since):
+            async with semaphore:
+                return await exchange.fetch_ohlcv(cfg.symbol, timeframe=cfg.timeframe, since=since,
+                                                  limit=cfg.candles_per_request)
+
+        pages = await asyncio.gather(*(fetch_page(since) for since in starts))
+    finally:
+        await exchange.close()
 
+    # Pages can overlap at their edges; keep one candle per timestamp, oldest first
+    candles = {candle[0]: candle for page in pages for candle in page}
+    return [candles[ts] for ts in sorted(candles)][-cfg.limit:]
+
+def fetch_data(cfg):
     # Fetch OHLCV from public endpoint
-    ohlcv = exchange.fetch_ohlcv(cfg.symbol, timeframe=cfg.timeframe, limit=cfg.limit)
+    ohlcv = asyncio.run(fetch_ohlcv_async(cfg))
 
-    df = pd.DataFrame(ohlcv, columns=["timestamp","open","high","low","close","volume"])
-    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    # Convert the list of candle lists once into a 2-D float64 array, then build the frame column by column
+    arr = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+    df = pd.DataFrame({
+        # Binance timestamps are epoch ms in UTC: convert the int64 column in one call, tz-aware
+        "timestamp": pd.to_datetime(arr[:, 0].astype(np.int64), unit="ms", utc=True, cache=True),
+        "open": arr[:, 1],
+        "high": arr[:, 2],
+        "low": arr[:, 3],
+        "close": arr[:, 4],
+        "volume": arr[:, 5],
+    })
     return df
 
 
 # -----------------------------
 # Backtesting Engine
 # -----------------------------
+@njit(cache=True)
+def _run_backtest_core(close, high, low, atr, start, grid_multiplier, take_profit_percent,
+                       stop_loss_percent, volume, initial_balance):
+    # Bar-by-bar simulation over float64 arrays. The position is held as a side (1 long, -1 short,
+    # 0 flat) and an entry price, since nopython mode has no dicts. Returns the final balance, the
+    # equity curve from bar `start` on, and the PnL of each closed trade.
+    n = len(close)
+    equity_curve = np.empty(n - start)
+    # A position opens on one bar and can close on the next at the earliest, so at most half the bars are exits
+    trades = np.empty((n - start) // 2)
+    n_trades = 0
+    balance = initial_balance
+    position_side = 0
+    position_entry = 0.0
+    position_tp = 0.0
+    position_sl = 0.0
+
+    # Loop invariants: TP/SL multipliers for each side and the PnL scale
+    tp_mul_long = 1 + take_profit_percent/100
+    sl_mul_long = 1 - stop_loss_percent/100
+    tp_mul_short = 1 - take_profit_percent/100
+    sl_mul_short = 1 + stop_loss_percent/100
+    pnl_scale = 1/volume
+
+    for i in range(start, n):
+        if position_side == 0:
+            # Entries only ever use the nearest grid level on each side; TP/SL are fixed at entry
+            grid_spacing = atr[i] * grid_multiplier
+            buy_level = close[i] - grid_spacing
+            sell_level = close[i] + grid_spacing
+            if low[i] <= buy_level:
+                position_side = 1
+                position_entry = buy_level
+                position_tp = buy_level * tp_mul_long
+                position_sl = buy_level * sl_mul_long
+            elif high[i] >= sell_level:
+                position_side = -1
+                position_entry = sell_level
+                position_tp = sell_level * tp_mul_short
+                position_sl = sell_level * sl_mul_short
+        else:
+            # TP/SL were fixed at entry, so an open position only costs two comparisons per bar
+            if position_side == 1:
+                hit_tp = high[i] >= position_tp
+                hit_sl = low[i] <= position_sl
+            else:
+                hit_tp = low[i] <= position_tp
+                hit_sl = high[i] >= position_sl
+            if hit_tp or hit_sl:
+                exit_price = position_tp if hit_tp else position_sl
+                pnl = (exit_price - position_entry) * position_side * pnl_scale
+                balance += pnl
+                trades[n_trades] = pnl
+                n_trades += 1
+                position_side = 0
+
+        equity_curve[i - start] = balance
+
+    return balance, equity_curve, trades[:n_trades]
+
 def run_backtest():
     cfg = Config()
 
     # Load OHLCV
     df = fetch_data(cfg)
-    df = calculate_atr(df, cfg.atr_period)
-
-    balance = cfg.initial_balance
-    equity_curve = []
-    trades = []
-    position = None
-
-    for i in range(cfg.atr_period, len(df)):
-        price = df["close"].iloc[i]
-        atr = df["ATR"].iloc[i]
-        grid_spacing = atr * cfg.grid_multiplier
-
-        buy_levels = [price - (j+1)*grid_spacing for j in range(cfg.num_of_grids)]
-        sell_levels = [price + (j+1)*grid_spacing for j in range(cfg.num_of_grids)]
-
-        if not position:
-            if df["low"].iloc[i] <= buy_levels[0]:
-                position = {"side":"long","entry":buy_levels[0]}
-            elif df["high"].iloc[i] >= sell_levels[0]:
-                position = {"side":"short","entry":sell_levels[0]}
-        else:
-            if position["side"] == "long":
-                tp = position["entry"] * (1 + cfg.take_profit_percent/100)
-                sl = position["entry"] * (1 - cfg.stop_loss_percent/100)
-                if df["high"].iloc[i] >= tp:
-                    pnl = (tp - position["entry"]) * (1/cfg.volume)
-                    balance += pnl
-                    trades.append(pnl)
-                    position = None
-                elif df["low"].iloc[i] <= sl:
-                    pnl = (sl - position["entry"]) * (1/cfg.volume)
-                    balance += pnl
-                    trades.append(pnl)
-                    position = None
-            elif position["side"] == "short":
-                tp = position["entry"] * (1 - cfg.take_profit_percent/100)
-                sl = position["entry"] * (1 + cfg.stop_loss_percent/100)
-                if df["low"].iloc[i] <= tp:
-                    pnl = (position["entry"] - tp) * (1/cfg.volume)
-                    balance += pnl
-                    trades.append(pnl)
-                    position = None
-                elif df["high"].iloc[i] >= sl:
-                    pnl = (position["entry"] - sl) * (1/cfg.volume)
-                    balance += pnl
-                    trades.append(pnl)
-                    position = None
-
-        equity_curve.append(balance)
-
-    equity_curve = np.array(equity_curve)
-    returns = pd.Series(trades)
-
-    metrics = {
-        "Initial Balance": cfg.initial_balance,
-        "Final Balance": round(balance, 2),
-        "Total Return (%)": round(((balance - cfg.initial_balance)/cfg.initial_balance)*100, 2),
-        "Number of Trades": len(trades),
-        "Win Rate (%)": round((returns[returns > 0].count()/len(returns))*100,2) if len(returns)>0 else 0,
-        "Average Win": round(returns[returns > 0].mean(),2) if len(returns[returns>0])>0 else 0,
-        "Average Loss": round(returns[returns < 0].mean(),2) if len(returns[returns<0])>0 else 0,
-        "Max Win": round(returns.max(),2) if len(returns)>0 else 0,
-        "Max Loss": round(returns.min(),2) if len(returns)>0 else 0,
-        "Max Drawdown (%)": round(max_drawdown(equity_curve)*100,2),
-        "Ulcer Index": round(ulcer_index(equity_curve),4),
-        "Sharpe Ratio": round(sharpe_ratio(returns),2) if len(returns)>1 else 0,
-        "Sortino Ratio": round(sortino_ratio(returns),2) if len(returns)>1 else 0,
-        "Calmar Ratio": round(calmar_ratio(returns, equity_curve),2) if len(returns)>1 else 0,
-        "Profit Factor": round(abs(returns[returns > 0].sum() / returns[returns < 0].sum()),2) if len(returns[returns<0])>0 else np.inf,
-        "Expectancy": round(returns.mean(),2) if len(returns)>0 else 0,
-        "Std Dev of Returns": round(returns.std(),2) if len(returns)>0 else 0,
-        "Skewness": round(returns.skew(),2) if len(returns)>0 else 0,
-        "Kurtosis": round(returns.kurtosis(),2) if len(returns)>0 else 0
-    }
+    df = calculate_atr(df, cfg.atr_period, cfg.atr_smoothing)
+
+    # Pull the columns out once as contiguous float64 arrays for the compiled bar loop
+    close_arr, high_arr, low_arr, atr_arr = (df[c].to_numpy(dtype=np.float64) for c in ["close", "high", "low", "ATR"])
+
+    balance, equity_curve, trades = _run_backtest_core(
+        close_arr, high_arr, low_arr, atr_arr, cfg.atr_period, cfg.grid_multiplier,
+        cfg.take_profit_percent, cfg.stop_loss_percent, cfg.volume, float(cfg.initial_balance),
+    )
+
+    metrics = compute_metrics(cfg, balance, trades, equity_curve)
 
     print("\n--- Backtest Results on Real Data ---")
     for k,v in metrics.items():
@@ -6,6 +6,7 @@ import asyncio
 import logging
 import logging.handlers
 import sys
+from collections import deque
 from dataclasses import dataclass
 from typing import Optional, Tuple, List, Dict
 
@@ -14,7 +15,6 @@ from binance.enums import *
 from binance.exceptions import BinanceAPIException, BinanceRequestException
 from binance.helpers import round_step_size
 import numpy as np
-import pandas as pd
 
 # Replace 'key_file' with your own module or method to securely load API keys
 # Ensure this file is secure and not tracked by version control
@@ -73,7 +73,7 @@ class BotConfig:
 # -----------------------------
 
 class BinanceBot:
-    def __init__(self, config: BotConfig):
+    def __init__(self, config: BotConfig, client: Optional[AsyncClient] = None):
         self.config = config
         self.api_key = k.binance_testnet_api_key   # Ensure your API keys are securely loaded
         self.api_secret = k.binance_testnet_api_secret
@@ -84,11 +84,20 @@ class BinanceBot:
         else:
             logger.info(f"Initialized BinanceBot for {self.config.symbol} with leverage {self.config.leverage}x.")
 
-        self.client: Optional[AsyncClient] = None
+        # Shared client injected by main(); a bot started on its own creates (and closes) its own
+        self.client: Optional[AsyncClient] = client
+        self._owns_client = client is None
         self.tick_size: Optional[float] = None
         self.step_size: Optional[float] = None
         self.active_orders: Dict[int, Dict] = {}
+        self._last_open_hash: Optional[int] = None  # Hash of the open order ids from the previous poll
         self.grid_spacing: float = 0.0
+        # Rolling ATR state, seeded once over REST and then advanced by the kline socket: the true
+        # ranges of the last `period` closed klines, the newest closed kline's close time and close
+        self._tr_window: Optional[deque] = None
+        self._last_kline_close_time: int = 0
+        self._last_close: float = 0.0
+        self._atr: float = np.nan
 
         self.console = Console()
         self.table = Table(title=f"Trading Data - {self.config.symbol}", box=box.SIMPLE_HEAVY)
@@ -99,22 +108,31 @@ class BinanceBot:
         self.table.add_column("Unrealized PnL")
         self.table.add_column("PnL (%)")
         self.table.add_column("Net PnL")
+        # A single row whose cells monitor_pnl overwrites in place
+        self.table.add_row(self.config.symbol, "0", "-", "-", "-", "-", "-")
+        self._pnl_cells = [column._cells for column in self.table.columns]
 
         # For WebSocket streams
         self.bsm: Optional[BinanceSocketManager] = None
         self.trade_socket = None
         self.depth_socket = None
+        self.user_socket = None
+        self.kline_socket = None
         self.trade_task = None
         self.depth_task = None
+        self.user_task = None
+        self._fill_tasks: set = set()  # Replacements in flight, referenced until done so they aren't collected
+        self.kline_task = None
 
     async def initialize_client(self):
         try:
-            self.client = await AsyncClient.create(
-                api_key=self.api_key,
-                api_secret=self.api_secret,
-                testnet=self.config.testnet
-            )
-            logger.info(f"Initialized Binance client for {self.config.symbol}")
+            if self.client is None:
+                self.client = await AsyncClient.create(
+                    api_key=self.api_key,
+                    api_secret=self.api_secret,
+                    testnet=self.config.testnet
+                )
+                logger.info(f"Initialized Binance client for {self.config.symbol}")
 
             await self.set_leverage()
             await self.get_symbol_info()
@@ -161,33 +179,59 @@ class BinanceBot:
             return None
 
     async def calculate_atr(self, period=14) -> float:
+        # Once seeded, the kline socket keeps the ATR current, so this is a plain state read
+        window = self._tr_window
+        if window is not None and window.maxlen == period and len(window) == period:
+            return self._atr
         try:
-            klines = await self.client.futures_klines(
+            # The newest kline returned is still open; seed from the `period` closed ones before it
+            klines = (await self.client.futures_klines(
                 symbol=self.config.symbol,
                 interval=AsyncClient.KLINE_INTERVAL_1MINUTE,
-                limit=period
-            )
-            df = pd.DataFrame(klines, columns=['open_time', 'open', 'high', 'low', 'close',
-                                               'volume', 'close_time', 'quote_asset_volume',
-                                               'number_of_trades', 'taker_buy_base_volume',
-                                               'taker_buy_quote_volume', 'ignore'])
-            df['high'] = df['high'].astype(float)
-            df['low'] = df['low'].astype(float)
-            df['close'] = df['close'].astype(float)
-            df['previous_close'] = df['close'].shift(1)
-            df['tr'] = df.apply(
-                lambda row: max(
-                    row['high'] - row['low'],
-                    abs(row['high'] - row['previous_close']),
-                    abs(row['low'] - row['previous_close'])
-                ), axis=1
-            )
-            atr = df['tr'].rolling(window=period).mean().iloc[-1]
-            return atr
+                limit=period + 1
+            ))[:-1]
+            # Only high/low/close are needed (fields 2-4 of each kline), parsed straight into float64
+            hlc = np.array([kline[2:5] for kline in klines], dtype=np.float64)
+            high, low, close = hlc[:, 0], hlc[:, 1], hlc[:, 2]
+            tr = high - low
+            # From the second bar on, compare against the previous close through views aligned
+            # one bar apart, rather than materialising a shifted copy of the closes
+            previous_close = close[:-1]
+            np.maximum(tr[1:], np.abs(high[1:] - previous_close), out=tr[1:])
+            np.maximum(tr[1:], np.abs(low[1:] - previous_close), out=tr[1:])
+            if len(tr) < period:
+                return np.nan
+            self._tr_window = deque(tr.tolist(), maxlen=period)
+            self._last_kline_close_time = klines[-1][6]  # Field 6 is the kline's close time
+            self._last_close = close[-1]
+            self._atr = tr.mean()
+            return self._atr
         except Exception as e:
             logger.error(f"Error calculating ATR: {e}")
             return 0.0
 
+    async def update_atr(self, kline: dict):
+        # Advance the rolling ATR by one closed kline from the socket. Klines up to the one the
+        # REST seed ended on are already counted, and nothing is tracked before the seed.
+        if self._tr_window is None or kline['T'] <= self._last_kline_close_time:
+            return
+        if kline['T'] - self._last_kline_close_time > 60_000:  # More than one 1m kline since the last
+            # Klines were missed (the socket reconnected, say): reseed over REST rather than bridge
+            # the gap with a stale close. If that fails the window stays empty and the next kline retries.
+            self._tr_window.clear()
+            atr = await self.calculate_atr(self._tr_window.maxlen)
+            if len(self._tr_window) == self._tr_window.maxlen:
+                self.grid_spacing = atr * self.config.grid_multiplier
+            return
+        high, low, close = float(kline['h']), float(kline['l']), float(kline['c'])
+        previous_close = self._last_close
+        self._tr_window.append(max(high - low, abs(high - previous_close), abs(low - previous_close)))
+        self._last_kline_close_time = kline['T']
+        self._last_close = close
+        self._atr = sum(self._tr_window) / len(self._tr_window)
+        # Replacement orders are spaced from grid_spacing, so they follow the current ATR
+        self.grid_spacing = self._atr * self.config.grid_multiplier
+
     async def adjust_grid(self):
         atr = await self.calculate_atr()
         self.grid_spacing = atr * self.config.grid_multiplier
@@ -202,12 +246,25 @@ class BinanceBot:
 
         grid_levels = np.arange(-self.config.num_of_grids, self.config.num_of_grids + 1) * self.grid_spacing + current_price
 
+        quantity = round_step_size(self.config.volume, step_size=self.step_size)
+        levels = []
         for price in grid_levels:
             price = round_step_size(price, step_size=self.tick_size)
             side = SIDE_BUY if price < current_price else SIDE_SELL
-            quantity = round_step_size(self.config.volume, step_size=self.step_size)
-            order = await self.place_limit_order(side, quantity, price)
-            if order:
+            levels.append((side, price))
+
+        # Place the whole grid concurrently, at most 10 orders in flight to stay under the order rate limit
+        semaphore = asyncio.Semaphore(10)
+
+        async def place(side, price):
+            async with semaphore:
+                return await self.place_limit_order(side, quantity, price)
+
+        results = await asyncio.gather(*(place(side, price) for side, price in levels), return_exceptions=True)
+        for (side, price), order in zip(levels, results):
+            if isinstance(order, Exception):
+                logger.error(f"Error placing {side} grid order at {price}: {order}")
+            elif order:
                 self.active_orders[order['orderId']] = {'side': side, 'price': price}
 
     async def place_limit_order(self, side: str, quantity: float, price: float) -> Optional[dict]:
@@ -231,8 +288,15 @@ class BinanceBot:
             self.bsm = BinanceSocketManager(self.client)
             self.depth_socket = self.bsm.futures_depth_socket(self.config.symbol)
             self.trade_socket = self.bsm.futures_symbol_ticker_socket(self.config.symbol)
+            self.user_socket = self.bsm.futures_user_socket()  # Pushes fills as ORDER_TRADE_UPDATE events
+            # Closed 1m klines keep the ATR current without polling futures_klines
+            self.kline_socket = self.bsm.kline_futures_socket(
+                self.config.symbol, interval=AsyncClient.KLINE_INTERVAL_1MINUTE
+            )
             self.depth_task = asyncio.create_task(self.handle_depth_socket())
             self.trade_task = asyncio.create_task(self.handle_trade_socket())
+            self.user_task = asyncio.create_task(self.handle_user_socket())
+            self.kline_task = asyncio.create_task(self.handle_kline_socket())
         except Exception as e:
             logger.error(f"Error starting streams: {e}")
 
@@ -250,9 +314,13 @@ class BinanceBot:
                     await asyncio.sleep(1)
 
     def calculate_order_book_imbalance(self, bids, asks):
-        bid_volume = sum(float(bid[1]) for bid in bids)
-        ask_volume = sum(float(ask[1]) for ask in asks)
-        imbalance = (bid_volume - ask_volume) / (bid_volume + ask_volume)
+        # Parse each side's [price, qty] string pairs into one float64 array and sum the qty column
+        bid_volume = np.asarray(bids, dtype=np.float64).reshape(-1, 2)[:, 1].sum()
+        ask_volume = np.asarray(asks, dtype=np.float64).reshape(-1, 2)[:, 1].sum()
+        total_volume = bid_volume + ask_volume
+        if total_volume == 0:
+            return 0.0  # Empty book update
+        imbalance = (bid_volume - ask_volume) / total_volume
         return imbalance
 
     async def handle_trade_socket(self):
@@ -265,42 +333,93 @@ class BinanceBot:
                     logger.error(f"Error in trade socket: {e}")
                     await asyncio.sleep(1)
 
+    async def handle_user_socket(self):
+        async with self.user_socket as stream:
+            while True:
+                try:
+                    res = await stream.recv()
+                    if res.get('e') == 'ORDER_TRADE_UPDATE':
+                        order = res['o']
+                        if order['s'] == self.config.symbol and order['X'] == 'FILLED':
+                            # Placed off the recv loop, so a burst of fills doesn't queue up behind
+                            # one REST round trip each while the socket goes unread
+                            task = asyncio.create_task(self.replace_filled_order(order['i']))
+                            self._fill_tasks.add(task)
+                            task.add_done_callback(self._fill_tasks.discard)
+                except Exception as e:
+                    logger.error(f"Error in user data socket: {e}")
+                    await asyncio.sleep(1)
+
+    async def handle_kline_socket(self):
+        async with self.kline_socket as stream:
+            while True:
+                try:
+                    res = await stream.recv()
+                    kline = res['k']
+                    if kline['x']:  # Only closed klines change the ATR
+                        await self.update_atr(kline)
+                except Exception as e:
+                    logger.error(f"Error in kline socket: {e}")
+                    await asyncio.sleep(1)
+
+    async def replace_filled_order(self, order_id: int):
+        order_info = self.active_orders.pop(order_id, None)
+        if order_info:
+            side = order_info['side']
+            price = order_info['price']
+            # Place a new order to maintain the grid
+            if side == SIDE_SELL:
+                new_sell_price = round_step_size(price + self.grid_spacing, step_size=self.tick_size)
+                new_order = await self.place_limit_order(SIDE_SELL, self.config.volume, new_sell_price)
+                if new_order:
+                    self.active_orders[new_order['orderId']] = {'side': SIDE_SELL, 'price': new_sell_price}
+            elif side == SIDE_BUY:
+                new_buy_price = round_step_size(price - self.grid_spacing, step_size=self.tick_size)
+                new_order = await self.place_limit_order(SIDE_BUY, self.config.volume, new_buy_price)
+                if new_order:
+                    self.active_orders[new_order['orderId']] = {'side': SIDE_BUY, 'price': new_buy_price}
+
     async def monitor_orders(self):
+        # Fills are handled as they are pushed on the user data socket; this REST poll is only a
+        # safety net for pushes lost while the socket was reconnecting
         while True:
             try:
+                # Only orders tracked before the request can be judged by it; anything the user data
+                # socket places while it is in flight would otherwise look filled
+                tracked = set(self.active_orders)
                 open_orders = await self.client.futures_get_open_orders(symbol=self.config.symbol)
-                open_order_ids = {order['orderId'] for order in open_orders}
 
-                filled_order_ids = set(self.active_orders.keys()) - open_order_ids
+                # Most polls return the same orders as the last one; skip the set difference for those
+                ids = tuple(order['orderId'] for order in open_orders)
+                ids_hash = hash(ids)
+                if ids_hash == self._last_open_hash and len(ids) == len(tracked):
+                    await asyncio.sleep(10)
+                    continue
+                self._last_open_hash = ids_hash
+
+                filled_order_ids = tracked - set(ids)
 
                 for order_id in filled_order_ids:
-                    order_info = self.active_orders.pop(order_id, None)
-                    if order_info:
-                        side = order_info['side']
-                        price = order_info['price']
-                        # Place a new order to maintain the grid
-                        if side == SIDE_SELL:
-                            new_sell_price = round_step_size(price + self.grid_spacing, step_size=self.tick_size)
-                            new_order = await self.place_limit_order(SIDE_SELL, self.config.volume, new_sell_price)
-                            if new_order:
-                                self.active_orders[new_order['orderId']] = {'side': SIDE_SELL, 'price': new_sell_price}
-                        elif side == SIDE_BUY:
-                            new_buy_price = round_step_size(price - self.grid_spacing, step_size=self.tick_size)
-                            new_order = await self.place_limit_order(SIDE_BUY, self.config.volume, new_buy_price)
-                            if new_order:
-                                self.active_orders[new_order['orderId']] = {'side': SIDE_BUY, 'price': new_buy_price}
-
-                await asyncio.sleep(0.5)
+                    await self.replace_filled_order(order_id)
+
+                await asyncio.sleep(10)
             except Exception as e:
                 logger.error(f"Exception in monitor_orders: {e}")
                 await asyncio.sleep(1)
 
+    def _set_pnl_row(self, *values: str):
+        # Overwrite the cells of the single table row after the symbol column
+        for cells, value in zip(self._pnl_cells[1:], values):
+            cells[0] = value
+
     async def monitor_pnl(self):
-        with Live(self.table, refresh_per_second=2, console=self.console):
+        last_row = None
+        # Rendered only when the row changes, so no background refresh thread is needed
+        with Live(self.table, auto_refresh=False, console=self.console) as live:
             while True:
                 try:
                     positions = await self.client.futures_position_information(symbol=self.config.symbol)
-                    position_found = False
+                    row = ("0", "-", "-", "-", "-", "-")  # No open position
                     for position in positions:
                         if position['symbol'] == self.config.symbol:
                             position_amt = float(position['positionAmt'])
@@ -310,9 +429,7 @@ class BinanceBot:
                                 unrealized_pnl = float(position['unRealizedProfit'])
                                 pnl_percent = (unrealized_pnl / (entry_price * abs(position_amt))) * 100
 
-                                self.table.rows = []
-                                self.table.add_row(
-                                    self.config.symbol,
+                                row = (
                                     f"{position_amt}",
                                     f"{entry_price}",
                                     f"{mark_price}",
@@ -320,20 +437,12 @@ class BinanceBot:
                                     f"{pnl_percent:.2f}%",
                                     f"{unrealized_pnl:.4f}"
                                 )
-                                position_found = True
                                 break
 
-                    if not position_found:
-                        self.table.rows = []
-                        self.table.add_row(
-                            self.config.symbol,
-                            "0",
-                            "-",
-                            "-",
-                            "-",
-                            "-",
-                            "-"
-                        )
+                    if row != last_row:
+                        self._set_pnl_row(*row)
+                        live.refresh()
+                        last_row = row
 
                     await asyncio.sleep(1)
                 except Exception as e:
@@ -352,7 +461,8 @@ class BinanceBot:
         except Exception as e:
             logger.error(f"Exception in run: {e}")
         finally:
-            if self.client:
+            # A shared client is closed by main() once every bot has stopped
+            if self.client and self._owns_client:
                 await self.client.close_connection()
                 logger.info(f"Closed Binance client for {self.config.symbol}")
 
@@ -430,6 +540,60 @@ class TestBinanceBot(unittest.IsolatedAsyncioTestCase):
         expected_imbalance = (3 - 2.5) / (3 + 2.5)
         self.assertAlmostEqual(imbalance, expected_imbalance)
 
+    async def test_user_socket_hands_off_fills(self):
+        stream = AsyncMock()
+        stream.recv.side_effect = [
+            {'e': 'ORDER_TRADE_UPDATE', 'o': {'s': 'BTCUSDT', 'X': 'FILLED', 'i': 12345}},
+            {'e': 'ORDER_TRADE_UPDATE', 'o': {'s': 'BTCUSDT', 'X': 'NEW', 'i': 12346}},
+            asyncio.CancelledError(),
+        ]
+        self.bot.user_socket = MagicMock()
+        self.bot.user_socket.__aenter__ = AsyncMock(return_value=stream)
+        self.bot.user_socket.__aexit__ = AsyncMock(return_value=False)
+        with patch.object(self.bot, 'replace_filled_order', new_callable=AsyncMock) as mock_replace:
+            with self.assertRaises(asyncio.CancelledError):
+                await self.bot.handle_user_socket()
+            await asyncio.gather(*self.bot._fill_tasks)
+            mock_replace.assert_awaited_once_with(12345)
+
+    async def test_update_atr_from_closed_kline(self):
+        self.bot._tr_window = deque([2.0, 4.0], maxlen=2)
+        self.bot._last_kline_close_time = 1000
+        self.bot._last_close = 100.0
+        # Already counted by the seed, so ignored
+        await self.bot.update_atr({'T': 1000, 'h': '150', 'l': '50', 'c': '100'})
+        self.assertEqual(list(self.bot._tr_window), [2.0, 4.0])
+        # The gap up from the previous close dominates the bar's own range
+        await self.bot.update_atr({'T': 2000, 'h': '106', 'l': '104', 'c': '105'})
+        self.assertEqual(list(self.bot._tr_window), [4.0, 6.0])
+        self.assertEqual(await self.bot.calculate_atr(period=2), 5.0)
+
+    async def test_closed_kline_updates_grid_spacing(self):
+        self.bot._tr_window = deque([2.0, 4.0], maxlen=2)
+        self.bot._last_kline_close_time = 1000
+        self.bot._last_close = 100.0
+        self.bot.grid_spacing = 0.3
+        await self.bot.update_atr({'T': 2000, 'h': '106', 'l': '104', 'c': '105'})
+        self.assertAlmostEqual(self.bot.grid_spacing, 5.0 * self.config.grid_multiplier)
+
+    async def test_kline_gap_reseeds_atr(self):
+        self.bot._tr_window = deque([2.0, 4.0], maxlen=2)
+        self.bot._last_kline_close_time = 59_999
+        self.bot._last_close = 100.0
+        self.bot.client = AsyncMock()
+        # Closed klines ending at 239_999 plus the still-open one, as REST returns them
+        self.bot.client.futures_klines.return_value = [
+            [0, '0', '101', '99', '100', '0', 179_999],
+            [0, '0', '103', '100', '102', '0', 239_999],
+            [0, '0', '0', '0', '0', '0', 299_999],
+        ]
+        # Two minutes after the last closed kline: one kline was missed
+        await self.bot.update_atr({'T': 239_999, 'h': '103', 'l': '100', 'c': '102'})
+        self.bot.client.futures_klines.assert_awaited_once()
+        self.assertEqual(list(self.bot._tr_window), [2.0, 3.0])
+        self.assertEqual(self.bot._last_kline_close_time, 239_999)
+        self.assertAlmostEqual(self.bot.grid_spacing, 2.5 * self.config.grid_multiplier)
+
 # -----------------------------
 # Main Function to Run Bots
 # -----------------------------
@@ -460,9 +624,23 @@ async def main():
         )
     ]
 
-    bots = [BinanceBot(config) for config in bot_configs]
+    # One client, and so one aiohttp connection pool, shared by every bot. Each bot still opens its
+    # own BinanceSocketManager: the manager caches sockets by path, so bots sharing one would also
+    # share (and split the messages of) the single user data socket.
+    client = await AsyncClient.create(
+        api_key=k.binance_testnet_api_key,
+        api_secret=k.binance_testnet_api_secret,
+        testnet=bot_configs[0].testnet
+    )
+    logger.info("Initialized shared Binance client")
+
+    bots = [BinanceBot(config, client) for config in bot_configs]
 
-    await asyncio.gather(*(bot.run() for bot in bots))
+    try:
+        await asyncio.gather(*(bot.run() for bot in bots))
+    finally:
+        await client.close_connection()
+        logger.info("Closed shared Binance client")
 
 # -----------------------------
 # Entry Point